@@ -1,7 +1,30 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime, timedelta
+import time
+
+# Marcado antes dos demais imports para o tempo até o primeiro elemento incluir a partida a frio
+inicio_execucao = time.perf_counter()
+
+from desempenho import aquecer, aquecido, marcar_primeiro_elemento, medir_importacoes, relatorio_inicializacao
+
+with medir_importacoes():
+    import heapq
+    import math
+    import os
+    import uuid
+    import streamlit as st
+    from datetime import date, datetime, timedelta
+    from itertools import chain, islice
+    from categorias import TabelaCategorias, contar_categorias
+    from dependencias import PREREQUISITOS_EXEMPLO, CicloDependencia, GrafoPrerequisitos
+    from graficos import criar_chart_burndown, criar_chart_elegante, criar_chart_velocidade
+    from historico import HistoricoProgresso, RollupDiario
+    from lembretes import EM_BREVE, ArquivoLembretes, CaixaEntrada, ServicoLembretes, WebhookLembretes
+    from metricas import HORIZONTE_URGENTES, calcular_metricas, tarefas_urgentes
+    from planejamento import ESFORCO_PADRAO, HORAS_POR_DIA_PADRAO, PlanejadorEstudos, PlanoBase
+    from recorrencia import FREQUENCIAS, JANELA_ATRASO, JANELA_LISTAGEM, AgendaRecorrente, criar_regras_exemplo, descrever
+    from tarefas import CATEGORIAS_EXEMPLO, TarefasSessao, criar_base_exemplo
+
+# pandas e plotly só são importados quando os gráficos são renderizados
+MODULOS_GRAFICO = ('pandas', 'plotly.express')
 
 # ============= CONFIGURAÇÃO DA PÁGINA =============
 st.set_page_config(
@@ -271,94 +294,150 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ============= INICIALIZAÇÃO DE DADOS =============
+# Os recursos compartilhados são chaveados pelo dia: os prazos de exemplo são
+# relativos a hoje, então a base é refeita uma vez por dia (e não fica presa
+# ao dia em que o processo subiu). Sessões abertas continuam com a base delas.
+@st.cache_resource(max_entries=2)
+def carregar_base_tarefas(hoje):
+    """Base de exemplo imutável do dia, compartilhada entre as sessões"""
+    return criar_base_exemplo(datetime.combine(hoje, datetime.min.time()))
+
+@st.cache_resource(max_entries=2)
+def carregar_regras_base(hoje):
+    """Rotinas de exemplo do dia, compartilhadas entre as sessões"""
+    return criar_regras_exemplo(datetime.combine(hoje, datetime.min.time()))
+
+@st.cache_resource(max_entries=2)
+def carregar_contagem_categorias(hoje):
+    """Tarefas da base por id de categoria, contadas uma vez por dia"""
+    return contar_categorias(carregar_base_tarefas(hoje).tarefas)
+
+@st.cache_resource(max_entries=2)
+def carregar_plano_base(hoje):
+    """Plano EDF das tarefas da base, montado uma vez por dia"""
+    return PlanoBase(carregar_base_tarefas(hoje).tarefas)
+
+@st.cache_resource(max_entries=2)
+def carregar_rollup_base(hoje):
+    """Rollup diário das tarefas da base, calculado uma vez por dia"""
+    return RollupDiario(carregar_base_tarefas(hoje).tarefas)
+
+@st.cache_resource
+def iniciar_lembretes():
+    """Serviço de lembretes do processo: uma thread e um heap para todas as sessões"""
+    caixa = CaixaEntrada()
+    servico = ServicoLembretes([caixa])
+    if os.environ.get('MSM_LEMBRETES_ARQUIVO'):
+        servico.adicionar_destino(ArquivoLembretes(os.environ['MSM_LEMBRETES_ARQUIVO']))
+    if os.environ.get('MSM_LEMBRETES_WEBHOOK'):
+        servico.adicionar_destino(WebhookLembretes(os.environ['MSM_LEMBRETES_WEBHOOK']))
+    servico.iniciar()
+    return servico, caixa
+
 def init_session_state():
     """Inicializa o estado da sessão com dados de exemplo"""
+    # Dia da base desta sessão, fixado na primeira execução
+    if 'dia_base' not in st.session_state:
+        st.session_state.dia_base = date.today()
+    hoje = st.session_state.dia_base
+    
     if 'tarefas' not in st.session_state:
-        st.session_state.tarefas = [
-            {
-                'id': 1,
-                'titulo': 'Estudar Cálculo II - Integrais',
-                'categoria': 'Matemática',
-                'prioridade': 'Alta',
-                'status': 'Em Progresso',
-                'prazo': datetime.now() + timedelta(days=2),
-                'descricao': 'Revisão completa de integrais impróprias e técnicas de integração'
-            },
-            {
-                'id': 2,
-                'titulo': 'Projeto IC - Análise de Dados',
-                'categoria': 'Projeto IC',
-                'prioridade': 'Alta',
-                'status': 'Em Progresso',
-                'prazo': datetime.now() + timedelta(days=7),
-                'descricao': 'Implementação do pipeline de análise e visualização'
-            },
-            {
-                'id': 3,
-                'titulo': 'Revisar Álgebra Linear',
-                'categoria': 'Matemática',
-                'prioridade': 'Média',
-                'status': 'Pendente',
-                'prazo': datetime.now() + timedelta(days=5),
-                'descricao': 'Foco em transformações lineares e autovalores'
-            },
-            {
-                'id': 4,
-                'titulo': 'Relatório de Pesquisa',
-                'categoria': 'Projeto IC',
-                'prioridade': 'Alta',
-                'status': 'Pendente',
-                'prazo': datetime.now() - timedelta(days=1),
-                'descricao': 'Escrita e revisão final do relatório'
-            },
-            {
-                'id': 5,
-                'titulo': 'Exercícios de Geometria Analítica',
-                'categoria': 'Matemática',
-                'prioridade': 'Baixa',
-                'status': 'Pendente',
-                'prazo': datetime.now() + timedelta(days=15),
-                'descricao': 'Capítulos 3-5 do livro de texto'
-            },
-            {
-                'id': 6,
-                'titulo': 'Apresentação IC',
-                'categoria': 'Projeto IC',
-                'prioridade': 'Média',
-                'status': 'Concluída',
-                'prazo': datetime.now() - timedelta(days=2),
-                'descricao': 'Apresentação dos resultados preliminares'
-            },
-        ]
+        # Cada sessão guarda só o delta das suas edições sobre a base compartilhada
+        st.session_state.tarefas = TarefasSessao(carregar_base_tarefas(hoje))
     
     if 'categorias' not in st.session_state:
-        st.session_state.categorias = ['Matemática', 'Projeto IC']
+        # Tarefas guardam o id da categoria; a tabela mantém nomes e contagens
+        categorias = TabelaCategorias(CATEGORIAS_EXEMPLO, carregar_contagem_categorias(hoje))
+        st.session_state.tarefas.inscrever(categorias.sincronizar)
+        st.session_state.categorias = categorias
+    
+    if 'recorrencias' not in st.session_state:
+        # Só as regras e as exceções por ocorrência; as ocorrências são geradas por janela
+        st.session_state.recorrencias = AgendaRecorrente(carregar_regras_base(hoje))
+    
+    if 'planejador' not in st.session_state:
+        # O plano da base é compartilhado; a sessão guarda só o delta das suas mutações
+        planejador = PlanejadorEstudos(carregar_plano_base(hoje), horas_por_dia=HORAS_POR_DIA_PADRAO)
+        st.session_state.tarefas.inscrever(planejador.sincronizar)
+        st.session_state.planejador = planejador
+    
+    if 'historico' not in st.session_state:
+        historico = HistoricoProgresso(carregar_rollup_base(hoje))
+        st.session_state.tarefas.inscrever(historico.sincronizar)
+        st.session_state.historico = historico
+    
+    if 'grafo' not in st.session_state:
+        grafo = GrafoPrerequisitos(st.session_state.tarefas.obter)
+        for pre, id_ in PREREQUISITOS_EXEMPLO:
+            grafo.adicionar(pre, id_)
+        st.session_state.tarefas.inscrever(grafo.sincronizar)
+        st.session_state.grafo = grafo
+    
+    if 'sessao_id' not in st.session_state:
+        # A base do dia é agendada uma vez por processo; a sessão só agenda o que alterar
+        # e é removida do serviço quando suas tarefas são coletadas
+        st.session_state.sessao_id = uuid.uuid4().hex
+        servico, _ = iniciar_lembretes()
+        servico.registrar_sessao(
+            st.session_state.sessao_id,
+            hoje,
+            carregar_base_tarefas(hoje).tarefas,
+            st.session_state.tarefas
+        )
     
     if 'show_edit_form' not in st.session_state:
         st.session_state.show_edit_form = False
     
     if 'edit_tarefa_id' not in st.session_state:
         st.session_state.edit_tarefa_id = None
+    
+    if 'pagina_tab2' not in st.session_state:
+        st.session_state.pagina_tab2 = 0
 
 init_session_state()
 
+def exibir_lembretes():
+    """Mostra como toast os lembretes disparados para esta sessão"""
+    _, caixa = iniciar_lembretes()
+    for lembrete in caixa.drenar(st.session_state.sessao_id):
+        if lembrete.tipo == EM_BREVE:
+            st.toast(f"**{lembrete.titulo}** vence em {lembrete.prazo:%d/%m}", icon="⏰")
+        else:
+            st.toast(f"**{lembrete.titulo}** está atrasada!", icon="🚨")
+
+exibir_lembretes()
+
+@st.fragment(run_every=0.5)
+def aguardar_graficos():
+    """Aviso enquanto a pilha de gráficos carrega; quando termina, reexecuta o app com os gráficos"""
+    if aquecido():
+        st.rerun()
+    st.caption("⏳ Carregando gráficos...")
+
 # ============= FUNÇÕES AUXILIARES =============
-def calcular_metricas():
-    """Calcula métricas principais"""
-    tarefas = st.session_state.tarefas
-    concluidas = sum(1 for t in tarefas if t['status'] == 'Concluída')
-    em_progresso = sum(1 for t in tarefas if t['status'] == 'Em Progresso')
-    pendentes = sum(1 for t in tarefas if t['status'] == 'Pendente')
-    total = len(tarefas)
-    percentual_conclusao = (concluidas / total * 100) if total > 0 else 0
-    
-    return {
-        'concluidas': concluidas,
-        'em_progresso': em_progresso,
-        'pendentes': pendentes,
-        'total': total,
-        'percentual': percentual_conclusao
-    }
+TAREFAS_POR_PAGINA = 10
+
+def obter_tarefa(id_):
+    """Busca uma tarefa avulsa ou uma ocorrência de rotina (id "regra@data")"""
+    if isinstance(id_, str):
+        return st.session_state.recorrencias.obter(id_)
+    return st.session_state.tarefas.obter(id_)
+
+def atualizar_tarefa(id_, **campos):
+    """Atualiza uma tarefa; numa ocorrência grava só a exceção daquela data"""
+    if isinstance(id_, str):
+        return st.session_state.recorrencias.atualizar(id_, **campos)
+    return st.session_state.tarefas.atualizar(id_, **campos)
+
+def excluir_tarefa(id_):
+    """Exclui uma tarefa ou uma única ocorrência de rotina"""
+    if isinstance(id_, str):
+        return st.session_state.recorrencias.remover(id_)
+    return st.session_state.tarefas.remover(id_)
+
+def ocorrencias_na_janela(inicio, fim):
+    """Ocorrências das rotinas com prazo entre as datas, geradas sob demanda"""
+    return st.session_state.recorrencias.ocorrencias(inicio, fim)
 
 def get_cor_prioridade(prioridade):
     """Retorna cor hex baseada na prioridade"""
@@ -395,10 +474,13 @@ def exibir_tarefa_estilizada(tarefa):
     emoji_status = get_emoji_status(tarefa['status'])
     emoji_prioridade = get_emoji_prioridade(tarefa['prioridade'])
     titulo = tarefa['titulo']
-    categoria = tarefa['categoria']
+    categoria = st.session_state.categorias.nome(tarefa['categoria'])
     prioridade = tarefa['prioridade']
     cor_prioridade = get_cor_prioridade(prioridade)
     descricao = tarefa.get('descricao', '')
+    esforco = tarefa.get('esforco', ESFORCO_PADRAO)
+    bloqueada = tarefa['status'] != 'Concluída' and st.session_state.grafo.bloqueada(tarefa['id'])
+    regra = st.session_state.recorrencias.regra(tarefa['regra_id']) if 'regra_id' in tarefa else None
     
     dias_restantes = (tarefa['prazo'].date() - datetime.now().date()).days
     
@@ -429,6 +511,9 @@ def exibir_tarefa_estilizada(tarefa):
                 </h3>
                 <div style="display: flex; gap: 0.75rem; flex-wrap: wrap; margin-bottom: 0.75rem;">
                     <span style="font-size: 0.875rem; color: #94A3B8;">📁 <strong>{categoria}</strong></span>
+                    <span style="font-size: 0.875rem; color: #94A3B8;">⏱️ {esforco:g}h</span>
+                    {'<span style="font-size: 0.875rem; color: #F97316;">🔒 Bloqueada</span>' if bloqueada else ''}
+                    {f'<span style="font-size: 0.875rem; color: #94A3B8;">🔁 {descrever(regra)}</span>' if regra else ''}
                     <span style="color: {cor_prioridade}; font-weight: 600; font-size: 0.875rem;">
                         {emoji_prioridade} {prioridade}
                     </span>
@@ -461,77 +546,24 @@ def exibir_tarefa_estilizada(tarefa):
     with col_actions[1]:
         if tarefa['status'] != 'Concluída':
             if st.button("✅ Concluir", key=f"concluir_{tarefa['id']}", use_container_width=True):
-                # Encontrar e atualizar a tarefa
-                for t in st.session_state.tarefas:
-                    if t['id'] == tarefa['id']:
-                        t['status'] = 'Concluída'
-                        st.success(f"✨ Tarefa '{tarefa['titulo']}' concluída!")
-                        st.rerun()
-                        break
+                atualizar_tarefa(tarefa['id'], status='Concluída')
+                st.success(f"✨ Tarefa '{tarefa['titulo']}' concluída!")
+                st.rerun()
         else:
             st.button("✅ Concluída", key=f"concluir_{tarefa['id']}", use_container_width=True, disabled=True)
     
     with col_actions[2]:
         if st.button("🗑️ Excluir", key=f"excluir_{tarefa['id']}", use_container_width=True):
-            st.session_state.tarefas = [t for t in st.session_state.tarefas if t['id'] != tarefa['id']]
+            excluir_tarefa(tarefa['id'])
             st.success(f"🗑️ Tarefa '{tarefa['titulo']}' excluída!")
             st.rerun()
 
-def criar_chart_elegante(df_filtrado):
-    """Cria um treemap elegante"""
-    df_filtrado = df_filtrado.copy()
-    df_filtrado['contagem'] = 1
-    
-    cores_prioridade = {
-        'Alta': '#EF4444',
-        'Média': '#F97316',
-        'Baixa': '#06B6D4',
-    }
-    
-    fig = px.treemap(
-        df_filtrado,
-        path=[px.Constant("Tarefas"), 'categoria', 'prioridade', 'status'],
-        values='contagem',
-        color='prioridade',
-        color_discrete_map=cores_prioridade,
-    )
-    
-    fig.update_layout(
-        margin=dict(t=40, l=20, r=20, b=20),
-        height=500,
-        paper_bgcolor='rgba(15, 23, 42, 0.9)',
-        font=dict(
-            color='#F1F5F9',
-            family='system-ui, -apple-system, sans-serif',
-            size=13
-        ),
-    )
-    
-    fig.update_traces(
-        textinfo="label+value",
-        textfont=dict(
-            size=12,
-            color='white',
-            family='system-ui, -apple-system, sans-serif'
-        ),
-        textposition='middle center',
-        marker=dict(
-            line=dict(width=2, color='rgba(15, 23, 42, 0.95)')
-        )
-    )
-    
-    return fig
-
 # ============= INTERFACE PRINCIPAL =============
 
 # Modal de edição de tarefa
 if st.session_state.show_edit_form and st.session_state.edit_tarefa_id:
     # Encontrar a tarefa a ser editada
-    tarefa_edit = None
-    for t in st.session_state.tarefas:
-        if t['id'] == st.session_state.edit_tarefa_id:
-            tarefa_edit = t
-            break
+    tarefa_edit = obter_tarefa(st.session_state.edit_tarefa_id)
     
     if tarefa_edit:
         st.markdown("### ✏️ Editar Tarefa")
@@ -552,10 +584,17 @@ if st.session_state.show_edit_form and st.session_state.edit_tarefa_id:
             
             col1, col2, col3 = st.columns(3)
             with col1:
+                categorias = st.session_state.categorias
+                opcoes_categoria = categorias.ativas()
+                categoria_atual = categorias.resolver(tarefa_edit['categoria'])
+                if categoria_atual not in opcoes_categoria:
+                    # Categoria arquivada continua disponível para a tarefa que já está nela
+                    opcoes_categoria.append(categoria_atual)
                 categoria = st.selectbox(
                     "📂 Categoria",
-                    st.session_state.categorias,
-                    index=st.session_state.categorias.index(tarefa_edit['categoria']) if tarefa_edit['categoria'] in st.session_state.categorias else 0
+                    opcoes_categoria,
+                    index=opcoes_categoria.index(categoria_atual),
+                    format_func=categorias.nome
                 )
             
             with col2:
@@ -572,10 +611,33 @@ if st.session_state.show_edit_form and st.session_state.edit_tarefa_id:
                     index=["Pendente", "Em Progresso", "Concluída"].index(tarefa_edit['status'])
                 )
             
-            prazo = st.date_input(
-                "📅 Data de Prazo",
-                value=tarefa_edit['prazo'].date()
-            )
+            col_prazo, col_esforco = st.columns(2)
+            with col_prazo:
+                prazo = st.date_input(
+                    "📅 Data de Prazo",
+                    value=tarefa_edit['prazo'].date()
+                )
+            
+            with col_esforco:
+                esforco = st.number_input(
+                    "⏱️ Esforço Estimado (horas)",
+                    min_value=0.5,
+                    max_value=200.0,
+                    step=0.5,
+                    value=float(tarefa_edit.get('esforco', ESFORCO_PADRAO))
+                )
+            
+            # Ocorrências de rotinas não entram no grafo de pré-requisitos
+            prerequisitos = None
+            if 'regra_id' not in tarefa_edit:
+                outras_tarefas = {t['id']: t['titulo'] for t in st.session_state.tarefas if t['id'] != tarefa_edit['id']}
+                prerequisitos = st.multiselect(
+                    "🔗 Pré-requisitos",
+                    options=list(outras_tarefas),
+                    default=[pre for pre in st.session_state.grafo.prerequisitos(tarefa_edit['id']) if pre in outras_tarefas],
+                    format_func=outras_tarefas.get,
+                    placeholder="Tarefas que precisam ser feitas antes desta"
+                )
             
             col_btn1, col_btn2 = st.columns(2)
             
@@ -599,20 +661,27 @@ if st.session_state.show_edit_form and st.session_state.edit_tarefa_id:
                 if not titulo.strip():
                     st.error("❌ O título é obrigatório!")
                 else:
-                    # Atualizar a tarefa
-                    for t in st.session_state.tarefas:
-                        if t['id'] == st.session_state.edit_tarefa_id:
-                            t['titulo'] = titulo
-                            t['descricao'] = descricao
-                            t['categoria'] = categoria
-                            t['prioridade'] = prioridade
-                            t['status'] = status
-                            t['prazo'] = datetime.combine(prazo, datetime.min.time())
-                            st.success(f"✨ Tarefa '{titulo}' atualizada com sucesso!")
-                            st.session_state.show_edit_form = False
-                            st.session_state.edit_tarefa_id = None
-                            st.rerun()
-                            break
+                    try:
+                        if prerequisitos is not None:
+                            st.session_state.grafo.definir_prerequisitos(st.session_state.edit_tarefa_id, prerequisitos)
+                    except CicloDependencia as erro:
+                        st.error(f"❌ {erro}!")
+                    else:
+                        # Atualizar a tarefa
+                        atualizar_tarefa(
+                            st.session_state.edit_tarefa_id,
+                            titulo=titulo,
+                            descricao=descricao,
+                            categoria=categoria,
+                            prioridade=prioridade,
+                            status=status,
+                            prazo=datetime.combine(prazo, datetime.min.time()),
+                            esforco=esforco,
+                        )
+                        st.success(f"✨ Tarefa '{titulo}' atualizada com sucesso!")
+                        st.session_state.show_edit_form = False
+                        st.session_state.edit_tarefa_id = None
+                        st.rerun()
         
         st.divider()
 
@@ -624,17 +693,24 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
+marcar_primeiro_elemento(inicio_execucao)
+# Depois da primeira pintura, carrega a pilha de gráficos em segundo plano; até
+# ela terminar, os gráficos ficam fora da execução para não esperar o import
+aquecer(*MODULOS_GRAFICO)
+graficos_prontos = aquecido()
+
 # Tabs principais
-tab1, tab2, tab3, tab4 = st.tabs([
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📊 Visão Geral",
     "🎯 Minhas Tarefas",
     "➕ Nova Tarefa",
-    "⚙️ Categorias"
+    "⚙️ Categorias",
+    "🗓️ Plano de Estudos"
 ])
 
 # ============= TAB 1: VISÃO GERAL =============
 with tab1:
-    metricas = calcular_metricas()
+    metricas = calcular_metricas(st.session_state.tarefas)
     
     # Progresso
     st.markdown("### 📈 Seu Progresso Geral")
@@ -686,50 +762,74 @@ with tab1:
     
     # Gráfico
     st.markdown("### 📂 Distribuição por Categorias")
-    df_tarefas = pd.DataFrame(st.session_state.tarefas)
-    
-    categorias_disponiveis = list(df_tarefas['categoria'].unique())
+    categorias = st.session_state.categorias
+    categorias_disponiveis = [id_ for id_ in categorias if categorias.contagem(id_)]
     tags_categorias = st.multiselect(
         "Selecione as categorias:",
         options=categorias_disponiveis,
         default=categorias_disponiveis,
+        format_func=categorias.nome,
         label_visibility="collapsed"
     )
     
     if not tags_categorias:
         st.warning("📌 Selecione pelo menos uma categoria para visualizar o gráfico.")
-    elif df_tarefas.empty or not df_tarefas['categoria'].isin(tags_categorias).any():
-        st.info("ℹ️ Nenhuma tarefa encontrada para as categorias selecionadas.")
     else:
-        df_filtrado = df_tarefas[df_tarefas['categoria'].isin(tags_categorias)].copy()
-        fig = criar_chart_elegante(df_filtrado)
-        st.plotly_chart(fig, width='stretch')
+        selecionadas = set(tags_categorias)
+        tarefas_grafico = [t for t in st.session_state.tarefas if categorias.resolver(t['categoria']) in selecionadas]
+        if not tarefas_grafico:
+            st.info("ℹ️ Nenhuma tarefa encontrada para as categorias selecionadas.")
+        elif not graficos_prontos:
+            st.caption("⏳ Carregando gráficos...")
+        else:
+            fig = criar_chart_elegante(tarefas_grafico, categorias)
+            st.plotly_chart(fig, width='stretch')
+    
+    st.divider()
+    
+    # Histórico
+    st.markdown("### 📉 Histórico de Progresso")
+    periodos = {"Últimos 30 dias": 30, "Últimos 90 dias": 90, "Semestre (180 dias)": 180}
+    periodo = st.selectbox("Período", list(periodos), key='periodo_historico', label_visibility="collapsed")
+    fim_periodo = datetime.now().date()
+    inicio_periodo = fim_periodo - timedelta(days=periodos[periodo] - 1)
+    # O rollup é chaveado por id; ids mesclados também contam para a categoria
+    categorias_historico = categorias.equivalentes(tags_categorias) if tags_categorias else None
+    
+    if not graficos_prontos:
+        aguardar_graficos()
+    else:
+        col_burndown, col_velocidade = st.columns(2)
+        with col_burndown:
+            st.markdown("#### Burndown")
+            serie = st.session_state.historico.serie_diaria(inicio_periodo, fim_periodo, categorias_historico)
+            st.plotly_chart(criar_chart_burndown(serie), width='stretch')
+        with col_velocidade:
+            st.markdown("#### Velocidade Semanal")
+            semanas = st.session_state.historico.velocidade_semanal(inicio_periodo, fim_periodo, categorias_historico)
+            st.plotly_chart(criar_chart_velocidade(semanas), width='stretch')
     
     st.divider()
     
     # Urgentes
     st.markdown("### 🔥 Foco da Semana - Tarefas Urgentes")
     
-    tarefas_urgentes = [
-        t for t in st.session_state.tarefas
-        if t['status'] != 'Concluída' and
-        (t['prazo'].date() - datetime.now().date()).days <= 7
-    ]
+    hoje = datetime.now().date()
+    urgentes = tarefas_urgentes(chain(
+        st.session_state.tarefas,
+        ocorrencias_na_janela(hoje - JANELA_ATRASO, hoje + timedelta(days=HORIZONTE_URGENTES))
+    ))
     
-    if tarefas_urgentes:
-        tarefas_urgentes_sorted = sorted(tarefas_urgentes, key=lambda x: x['prazo'])
-        
-        for tarefa in tarefas_urgentes_sorted:
-            dias_restantes = (tarefa['prazo'].date() - datetime.now().date()).days
-            
+    if urgentes:
+        for tarefa, dias_restantes in urgentes:
             if dias_restantes < 0:
-                st.error(f"🚨 **ATRASADA**: {tarefa['titulo']} ({tarefa['categoria']}) - {abs(dias_restantes)} dias atrás")
+                st.error(f"🚨 **ATRASADA**: {tarefa['titulo']} ({categorias.nome(tarefa['categoria'])}) - {abs(dias_restantes)} dias atrás")
             elif dias_restantes == 0:
-                st.error(f"🔴 **VENCE HOJE**: {tarefa['titulo']} ({tarefa['categoria']})")
+                st.error(f"🔴 **VENCE HOJE**: {tarefa['titulo']} ({categorias.nome(tarefa['categoria'])})")
             elif dias_restantes <= 3:
-                st.warning(f"🟠 **VENCE EM {dias_restantes} DIAS**: {tarefa['titulo']} ({tarefa['categoria']})")
+                st.warning(f"🟠 **VENCE EM {dias_restantes} DIAS**: {tarefa['titulo']} ({categorias.nome(tarefa['categoria'])})")
             else:
-                st.info(f"🔵 **VENCE EM {dias_restantes} DIAS**: {tarefa['titulo']} ({tarefa['categoria']})")
+                st.info(f"🔵 **VENCE EM {dias_restantes} DIAS**: {tarefa['titulo']} ({categorias.nome(tarefa['categoria'])})")
     else:
         st.success("✅ Nenhuma tarefa urgente para os próximos 7 dias! Excelente trabalho!")
 
@@ -739,9 +839,11 @@ with tab2:
     
     col1, col2, col3 = st.columns(3)
     with col1:
+        nome_categoria = st.session_state.categorias.nome
         filtro_categoria = st.selectbox(
             "Categoria",
-            ["Todas"] + list(pd.DataFrame(st.session_state.tarefas)['categoria'].unique()),
+            ["Todas"] + list(st.session_state.categorias),
+            format_func=lambda c: c if c == "Todas" else nome_categoria(c),
             key='filtro_cat_tab2'
         )
     with col2:
@@ -757,22 +859,64 @@ with tab2:
             key='filtro_prio_tab2'
         )
     
-    tarefas_filtradas = st.session_state.tarefas
-    if filtro_categoria != "Todas":
-        tarefas_filtradas = [t for t in tarefas_filtradas if t['categoria'] == filtro_categoria]
-    if filtro_status != "Todos":
-        tarefas_filtradas = [t for t in tarefas_filtradas if t['status'] == filtro_status]
-    if filtro_prioridade != "Todas":
-        tarefas_filtradas = [t for t in tarefas_filtradas if t['prioridade'] == filtro_prioridade]
+    def passa_filtros(t):
+        return (
+            (filtro_categoria == "Todas" or st.session_state.categorias.resolver(t['categoria']) == filtro_categoria)
+            and (filtro_status == "Todos" or t['status'] == filtro_status)
+            and (filtro_prioridade == "Todas" or t['prioridade'] == filtro_prioridade)
+        )
+    
+    filtros = (filtro_categoria, filtro_status, filtro_prioridade)
+    if st.session_state.get('filtros_tab2') != filtros:
+        st.session_state.filtros_tab2 = filtros
+        st.session_state.pagina_tab2 = 0
+    
+    def por_prazo(t):
+        return t['prazo']
+    
+    # Abertas antes das concluídas, cada grupo por prazo. As ocorrências das rotinas
+    # são intercaladas de forma preguiçosa: só o necessário para a página atual é gerado.
+    hoje = datetime.now().date()
+    tarefas_filtradas = sorted((t for t in st.session_state.tarefas if passa_filtros(t)), key=por_prazo)
+    def grupo(concluidas):
+        return heapq.merge(
+            [t for t in tarefas_filtradas if (t['status'] == 'Concluída') == concluidas],
+            (
+                o for o in ocorrencias_na_janela(hoje - JANELA_ATRASO, hoje + JANELA_LISTAGEM)
+                if (o['status'] == 'Concluída') == concluidas and passa_filtros(o)
+            ),
+            key=por_prazo
+        )
+    
+    pagina = st.session_state.pagina_tab2
+    inicio_pagina = pagina * TAREFAS_POR_PAGINA
+    itens_pagina = list(islice(
+        chain(grupo(False), grupo(True)),
+        inicio_pagina,
+        inicio_pagina + TAREFAS_POR_PAGINA + 1
+    ))
+    tem_proxima = len(itens_pagina) > TAREFAS_POR_PAGINA
     
     st.divider()
     
-    if not tarefas_filtradas:
+    if not itens_pagina:
         st.info("📭 Nenhuma tarefa encontrada com esses filtros.")
     else:
-        tarefas_filtradas.sort(key=lambda x: (x['status'] == 'Concluída', x['prazo']))
-        for tarefa in tarefas_filtradas:
+        for tarefa in itens_pagina[:TAREFAS_POR_PAGINA]:
             exibir_tarefa_estilizada(tarefa)
+    
+    if pagina > 0 or tem_proxima:
+        col_anterior, col_pagina, col_proxima = st.columns([1, 2, 1])
+        with col_anterior:
+            if st.button("⬅️ Anterior", key='pagina_anterior', disabled=pagina == 0, use_container_width=True):
+                st.session_state.pagina_tab2 -= 1
+                st.rerun()
+        with col_pagina:
+            st.markdown(f"<div style='text-align: center; color: #94A3B8;'>Página {pagina + 1}</div>", unsafe_allow_html=True)
+        with col_proxima:
+            if st.button("Próxima ➡️", key='pagina_proxima', disabled=not tem_proxima, use_container_width=True):
+                st.session_state.pagina_tab2 += 1
+                st.rerun()
 
 # ============= TAB 3: NOVA TAREFA =============
 with tab3:
@@ -796,7 +940,8 @@ with tab3:
         with col1:
             categoria = st.selectbox(
                 "📂 Categoria",
-                st.session_state.categorias
+                st.session_state.categorias.ativas(),
+                format_func=st.session_state.categorias.nome
             )
             prioridade = st.selectbox(
                 "🎯 Prioridade",
@@ -808,6 +953,32 @@ with tab3:
                 "📅 Data de Prazo",
                 value=datetime.now() + timedelta(days=7)
             )
+            esforco = st.number_input(
+                "⏱️ Esforço Estimado (horas)",
+                min_value=0.5,
+                max_value=200.0,
+                step=0.5,
+                value=ESFORCO_PADRAO
+            )
+        
+        col_rep1, col_rep2, col_rep3 = st.columns(3)
+        with col_rep1:
+            repeticao = st.selectbox(
+                "🔁 Repetir",
+                ["Não repetir"] + list(FREQUENCIAS.values())
+            )
+        with col_rep2:
+            intervalo = st.number_input(
+                "A cada (intervalo)",
+                min_value=1,
+                max_value=52,
+                value=1
+            )
+        with col_rep3:
+            fim_repeticao = st.date_input(
+                "Repetir até (opcional)",
+                value=None
+            )
         
         col_submit = st.columns([1, 4])
         with col_submit[0]:
@@ -820,46 +991,120 @@ with tab3:
         if submitted:
             if not titulo.strip():
                 st.error("❌ O título é obrigatório!")
+            elif repeticao != "Não repetir":
+                if fim_repeticao is not None and fim_repeticao < prazo:
+                    st.error("❌ A data final da repetição deve ser depois do primeiro prazo!")
+                else:
+                    frequencia = next(chave for chave, nome in FREQUENCIAS.items() if nome == repeticao)
+                    st.session_state.recorrencias.adicionar_regra({
+                        'titulo': titulo,
+                        'categoria': categoria,
+                        'prioridade': prioridade,
+                        'frequencia': frequencia,
+                        'intervalo': int(intervalo),
+                        'inicio': datetime.combine(prazo, datetime.min.time()),
+                        'fim': datetime.combine(fim_repeticao, datetime.min.time()) if fim_repeticao else None,
+                        'esforco': esforco,
+                        'descricao': descricao,
+                    })
+                    st.success(f"🔁 Rotina '{titulo}' criada com sucesso!")
             else:
                 nova_tarefa = {
-                    'id': max([t['id'] for t in st.session_state.tarefas], default=0) + 1,
+                    'id': st.session_state.tarefas.proximo_id(),
                     'titulo': titulo,
                     'categoria': categoria,
                     'prioridade': prioridade,
                     'status': 'Pendente',
                     'prazo': datetime.combine(prazo, datetime.min.time()),
+                    'esforco': esforco,
                     'descricao': descricao,
                 }
                 
-                st.session_state.tarefas.append(nova_tarefa)
+                st.session_state.tarefas.adicionar(nova_tarefa)
                 st.success(f"🎉 Tarefa '{titulo}' criada com sucesso!")
                 st.balloons()
+    
+    if len(st.session_state.recorrencias):
+        st.markdown("#### 🔁 Rotinas")
+        for regra in list(st.session_state.recorrencias):
+            col_info, col_btn = st.columns([4, 1])
+            with col_info:
+                st.markdown(f"**{regra['titulo']}** ({st.session_state.categorias.nome(regra['categoria'])}) • {descrever(regra)} • desde {regra['inicio']:%d/%m/%Y}")
+            with col_btn:
+                if st.button("🗑️ Encerrar", key=f"encerrar_regra_{regra['id']}"):
+                    st.session_state.recorrencias.remover_regra(regra['id'])
+                    st.success(f"✅ Rotina '{regra['titulo']}' encerrada!")
+                    st.rerun()
 
 # ============= TAB 4: CATEGORIAS =============
 with tab4:
     st.markdown("### 🏷️ Gerenciar Categorias")
-    st.markdown("Adicione ou remova categorias para organizar melhor suas tarefas.")
+    st.markdown("Adicione, renomeie, mescle, arquive ou remova categorias para organizar melhor suas tarefas.")
     
     st.divider()
     
     st.markdown("#### 📋 Categorias Existentes")
     
-    if st.session_state.categorias:
-        for cat in st.session_state.categorias:
-            tarefas_cat = sum(1 for t in st.session_state.tarefas if t['categoria'] == cat)
+    categorias = st.session_state.categorias
+    if len(categorias):
+        for id_cat in list(categorias):
+            cat = categorias.nome(id_cat)
+            tarefas_cat = categorias.contagem(id_cat)
+            arquivada = categorias.arquivada(id_cat)
             col_info, col_btn = st.columns([4, 1])
             
             with col_info:
-                st.markdown(f"**📁 {cat}** • {tarefas_cat} tarefa(s)")
+                st.markdown(f"**📁 {cat}** • {tarefas_cat} tarefa(s)" + (" • 🗄️ arquivada" if arquivada else ""))
             
             with col_btn:
-                if st.button("🗑️ Remover", key=f"del_{cat}"):
-                    if tarefas_cat > 0:
-                        st.error(f"❌ Não é possível remover '{cat}' pois há {tarefas_cat} tarefa(s) associada(s).")
+                if st.button("🗑️ Remover", key=f"del_{id_cat}"):
+                    rotinas_cat = sum(1 for r in st.session_state.recorrencias if categorias.resolver(r['categoria']) == id_cat)
+                    if tarefas_cat > 0 or rotinas_cat > 0:
+                        st.error(f"❌ Não é possível remover '{cat}' pois há {tarefas_cat} tarefa(s) e {rotinas_cat} rotina(s) associada(s).")
                     else:
-                        st.session_state.categorias.remove(cat)
+                        categorias.remover(id_cat)
                         st.success(f"✅ Categoria '{cat}' removida!")
                         st.rerun()
+            
+            with st.expander(f"⚙️ Editar '{cat}'"):
+                col_nome, col_renomear = st.columns([3, 1])
+                with col_nome:
+                    novo_nome = st.text_input("Novo nome", value=cat, max_chars=50, key=f"nome_cat_{id_cat}")
+                with col_renomear:
+                    st.write("")
+                    if st.button("✏️ Renomear", key=f"renomear_cat_{id_cat}", use_container_width=True):
+                        if not novo_nome.strip():
+                            st.error("❌ Digite um nome para a categoria!")
+                        elif novo_nome != cat and categorias.id_por_nome(novo_nome) is not None:
+                            st.error(f"❌ A categoria '{novo_nome}' já existe!")
+                        else:
+                            categorias.renomear(id_cat, novo_nome)
+                            st.success(f"✅ Categoria renomeada para '{novo_nome}'!")
+                            st.rerun()
+                
+                outras = [outra for outra in categorias if outra != id_cat]
+                col_destino, col_mesclar = st.columns([3, 1])
+                with col_destino:
+                    destino = st.selectbox(
+                        "Mesclar em",
+                        outras,
+                        format_func=categorias.nome,
+                        key=f"destino_cat_{id_cat}"
+                    )
+                with col_mesclar:
+                    st.write("")
+                    if st.button("🔀 Mesclar", key=f"mesclar_cat_{id_cat}", disabled=not outras, use_container_width=True):
+                        nome_destino = categorias.nome(destino)
+                        categorias.mesclar(id_cat, destino)
+                        st.success(f"✅ '{cat}' mesclada em '{nome_destino}'!")
+                        st.rerun()
+                
+                if st.button(
+                    "📤 Desarquivar" if arquivada else "🗄️ Arquivar",
+                    key=f"arquivar_cat_{id_cat}"
+                ):
+                    categorias.arquivar(id_cat, not arquivada)
+                    st.rerun()
     else:
         st.info("ℹ️ Nenhuma categoria criada ainda.")
     
@@ -882,13 +1127,110 @@ with tab4:
         if st.button("✅ Adicionar", type="primary", use_container_width=True):
             if not nova_categoria.strip():
                 st.error("❌ Digite um nome para a categoria!")
-            elif nova_categoria in st.session_state.categorias:
+            elif st.session_state.categorias.id_por_nome(nova_categoria) is not None:
                 st.error(f"❌ A categoria '{nova_categoria}' já existe!")
             else:
-                st.session_state.categorias.append(nova_categoria)
+                st.session_state.categorias.adicionar(nova_categoria)
                 st.success(f"🎉 Categoria '{nova_categoria}' criada com sucesso!")
                 st.rerun()
 
+# ============= TAB 5: PLANO DE ESTUDOS =============
+with tab5:
+    st.markdown("### 🗓️ Plano de Estudos")
+    st.markdown("Distribui o esforço das tarefas abertas pelos próximos dias, priorizando os prazos mais próximos.")
+    
+    planejador = st.session_state.planejador
+    planejador.definir_hoje(datetime.now().date())
+    
+    col_horas, col_dias = st.columns(2)
+    with col_horas:
+        horas_por_dia = st.number_input(
+            "⏱️ Horas de estudo por dia",
+            min_value=0.5,
+            max_value=24.0,
+            step=0.5,
+            value=planejador.horas_por_dia,
+            key='horas_por_dia'
+        )
+        planejador.definir_horas(horas_por_dia)
+    with col_dias:
+        dias_plano = st.slider("📅 Dias exibidos", min_value=7, max_value=30, value=14, key='dias_plano')
+    
+    st.divider()
+    
+    inviaveis = planejador.inviaveis()
+    if inviaveis:
+        st.markdown("#### ⚠️ Tarefas que não cabem no prazo")
+        for id_, conclusao, prazo_tarefa in inviaveis:
+            tarefa = st.session_state.tarefas.obter(id_)
+            st.error(
+                f"🚨 **{tarefa['titulo']}** ({st.session_state.categorias.nome(tarefa['categoria'])}) - prazo {prazo_tarefa:%d/%m}, "
+                f"conclusão prevista {conclusao:%d/%m}"
+            )
+    elif len(planejador):
+        st.success("✅ Todas as tarefas abertas cabem nos prazos com esse ritmo!")
+    
+    if not len(planejador):
+        st.info("📭 Nenhuma tarefa aberta para planejar.")
+    else:
+        total_horas = planejador.total_horas()
+        st.caption(f"{len(planejador)} tarefa(s) abertas • {total_horas:g}h no total • ~{total_horas / horas_por_dia:.0f} dia(s) de estudo")
+        
+        for dia, itens in planejador.plano(dias_plano):
+            if not itens:
+                continue
+            st.markdown(f"#### 📅 {dia:%d/%m} • {sum(horas for _, horas in itens):g}h")
+            for id_, horas in itens:
+                tarefa = st.session_state.tarefas.obter(id_)
+                emoji_prioridade = get_emoji_prioridade(tarefa['prioridade'])
+                st.markdown(f"{emoji_prioridade} **{tarefa['titulo']}** ({st.session_state.categorias.nome(tarefa['categoria'])}) - {horas:g}h")
+    
+    st.divider()
+    
+    st.markdown("### 🔗 Dependências")
+    grafo = st.session_state.grafo
+    tarefas_abertas = [t for t in st.session_state.tarefas if t['status'] != 'Concluída']
+    bloqueadas = [t for t in tarefas_abertas if grafo.bloqueada(t['id'])]
+    st.caption(f"{len(tarefas_abertas) - len(bloqueadas)} tarefa(s) prontas para começar • {len(bloqueadas)} bloqueada(s)")
+    
+    for tarefa in bloqueadas:
+        nomes = ", ".join(st.session_state.tarefas.obter(pre)['titulo'] for pre in grafo.bloqueios(tarefa['id']))
+        st.warning(f"🔒 **{tarefa['titulo']}** aguarda: {nomes}")
+    
+    com_dependencias = [t for t in tarefas_abertas if t['id'] in grafo]
+    if com_dependencias:
+        titulos = {t['id']: t['titulo'] for t in com_dependencias}
+        alvo = st.selectbox(
+            "🎯 Caminho crítico até o prazo de",
+            options=list(titulos),
+            format_func=titulos.get,
+            key='alvo_caminho_critico'
+        )
+        caminho, horas_caminho = grafo.caminho_critico(alvo)
+        tarefa_alvo = st.session_state.tarefas.obter(alvo)
+        dias_necessarios = math.ceil(horas_caminho / planejador.horas_por_dia)
+        dias_ate_prazo = (tarefa_alvo['prazo'].date() - datetime.now().date()).days + 1
+        
+        st.markdown(" ➜ ".join(f"**{st.session_state.tarefas.obter(id_)['titulo']}**" for id_ in caminho))
+        if dias_necessarios > dias_ate_prazo:
+            st.error(f"🚨 A cadeia exige {horas_caminho:g}h (~{dias_necessarios} dia(s)), mas restam {max(dias_ate_prazo, 0)} dia(s) até o prazo.")
+        else:
+            st.success(f"✅ A cadeia exige {horas_caminho:g}h (~{dias_necessarios} dia(s)) e cabe nos {dias_ate_prazo} dia(s) até o prazo.")
+    else:
+        st.info("ℹ️ Nenhuma tarefa aberta com pré-requisitos. Adicione ligações ao editar uma tarefa.")
+
+# Relatório de inicialização (abra com ?perf=1 na URL)
+if st.query_params.get("perf") == "1":
+    with st.sidebar.expander("⏱️ Tempo de Inicialização", expanded=True):
+        relatorio = relatorio_inicializacao()
+        for chave, segundos in relatorio['primeiro_elemento'].items():
+            st.markdown(f"**Primeiro elemento ({chave.replace('_', ' ')})**: {segundos * 1000:.0f} ms")
+        if relatorio['importacoes']:
+            for nome, info in relatorio['importacoes'].items():
+                st.markdown(f"📦 `{nome}`: {info['segundos'] * 1000:.0f} ms ({info['thread']})")
+        else:
+            st.caption("Nenhum módulo pesado carregado ainda.")
+
 # Footer
 st.divider()
 st.markdown("<div style='text-align: center; color: #64748B; font-size: 0.875rem;'><p>🎯 Math Study Manager</p><p style='font-size: 0.75rem;'></p></div>", unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,145 @@
+from collections import Counter
+
+
+def contar_categorias(tarefas):
+    """Quantidade de tarefas por id de categoria (para montar a tabela sem varrer de novo)"""
+    return Counter(tarefa['categoria'] for tarefa in tarefas)
+
+
+class TabelaCategorias:
+    """Tabela de categorias com ids inteiros estáveis.
+
+    As tarefas guardam só o id da categoria; o nome é procurado aqui na hora
+    de exibir. Renomear e arquivar mudam apenas a entrada da categoria (O(1)).
+    Mesclar não reescreve as tarefas: o id de origem passa a apontar para o
+    de destino em `_apelidos` e a contagem é somada, em O(k) para os k ids já
+    mesclados na origem. A contagem por categoria é mantida pelo ouvinte
+    `sincronizar`, então remover uma categoria não precisa contar as tarefas.
+    """
+
+    def __init__(self, nomes=(), contagem=None):
+        self._nomes = {}
+        self._por_nome = {}
+        self._arquivadas = set()
+        self._apelidos = {}
+        self._origens = {}
+        self._contagem = Counter()
+        self._max_id = 0
+        for nome in nomes:
+            self.adicionar(nome)
+        for id_, quantidade in (contagem or {}).items():
+            self._contagem[self.resolver(id_)] += quantidade
+
+    def __len__(self):
+        return len(self._nomes)
+
+    def __iter__(self):
+        return iter(self._nomes)
+
+    def __contains__(self, id_):
+        return self.resolver(id_) in self._nomes
+
+    # ----- consultas -----
+    def resolver(self, id_):
+        """Id vigente de uma categoria, seguindo as mesclagens"""
+        return self._apelidos.get(id_, id_)
+
+    def nome(self, id_):
+        """Nome para exibição (o id cru se a categoria não existe)"""
+        return self._nomes.get(self.resolver(id_), str(id_))
+
+    def id_por_nome(self, nome):
+        """Id da categoria com esse nome (ou None)"""
+        return self._por_nome.get(nome)
+
+    def id_para(self, nome):
+        """Id da categoria com esse nome, criando-a se preciso (para ler arquivos com nomes)"""
+        id_ = self._por_nome.get(nome)
+        return self.adicionar(nome) if id_ is None else id_
+
+    def contagem(self, id_):
+        """Tarefas associadas à categoria, sem varrer as tarefas"""
+        return self._contagem.get(self.resolver(id_), 0)
+
+    def arquivada(self, id_):
+        """True se a categoria está arquivada"""
+        return self.resolver(id_) in self._arquivadas
+
+    def ativas(self):
+        """Ids das categorias não arquivadas, na ordem de criação"""
+        return [id_ for id_ in self._nomes if id_ not in self._arquivadas]
+
+    def equivalentes(self, ids):
+        """Todos os ids (inclusive os mesclados) que resolvem para os ids dados"""
+        resultado = set()
+        for id_ in ids:
+            id_ = self.resolver(id_)
+            resultado.add(id_)
+            resultado.update(self._origens.get(id_, ()))
+        return resultado
+
+    # ----- metadados -----
+    def adicionar(self, nome):
+        """Cria uma categoria e retorna o id"""
+        self._verificar_nome(nome)
+        self._max_id += 1
+        self._nomes[self._max_id] = nome
+        self._por_nome[nome] = self._max_id
+        return self._max_id
+
+    def renomear(self, id_, nome):
+        """Troca o nome sem tocar nas tarefas"""
+        id_ = self.resolver(id_)
+        if self._nomes[id_] != nome:
+            self._verificar_nome(nome)
+            del self._por_nome[self._nomes[id_]]
+            self._nomes[id_] = nome
+            self._por_nome[nome] = id_
+
+    def arquivar(self, id_, arquivada=True):
+        """Esconde (ou reexibe) a categoria nas listas de escolha; as tarefas continuam nela"""
+        id_ = self.resolver(id_)
+        if arquivada:
+            self._arquivadas.add(id_)
+        else:
+            self._arquivadas.discard(id_)
+
+    def mesclar(self, origem, destino):
+        """Move as tarefas de `origem` para `destino` redirecionando o id"""
+        origem, destino = self.resolver(origem), self.resolver(destino)
+        if origem == destino:
+            return
+        origens = self._origens.pop(origem, [])
+        origens.append(origem)
+        for antigo in origens:
+            self._apelidos[antigo] = destino
+        self._origens.setdefault(destino, []).extend(origens)
+        self._contagem[destino] += self._contagem.pop(origem, 0)
+        del self._por_nome[self._nomes.pop(origem)]
+        self._arquivadas.discard(origem)
+
+    def remover(self, id_):
+        """Remove uma categoria vazia; retorna False se ainda há tarefas nela"""
+        id_ = self.resolver(id_)
+        if self._contagem.get(id_, 0) > 0:
+            return False
+        for antigo in self._origens.pop(id_, ()):
+            del self._apelidos[antigo]
+        if id_ in self._nomes:
+            del self._por_nome[self._nomes.pop(id_)]
+        self._arquivadas.discard(id_)
+        self._contagem.pop(id_, None)
+        return True
+
+    # ----- contagem -----
+    def sincronizar(self, id_, tarefa, anterior):
+        """Ouvinte de TarefasSessao: mantém a contagem por categoria"""
+        if anterior is not None:
+            self._contagem[self.resolver(anterior['categoria'])] -= 1
+        if tarefa is not None:
+            self._contagem[self.resolver(tarefa['categoria'])] += 1
+
+    # ----- internos -----
+    def _verificar_nome(self, nome):
+        if nome in self._por_nome:
+            raise ValueError(f"A categoria '{nome}' já existe")
@@ -0,0 +1,211 @@
+from planejamento import ESFORCO_PADRAO
+
+# Pares (pré-requisito, tarefa) dos dados de exemplo
+PREREQUISITOS_EXEMPLO = ((3, 2),)
+
+
+class CicloDependencia(ValueError):
+    """Levantada quando um pré-requisito criaria um ciclo"""
+
+
+class GrafoPrerequisitos:
+    """Grafo de pré-requisitos entre tarefas com ordem topológica incremental.
+
+    Só as tarefas que participam de alguma ligação viram nós. A ordem é
+    mantida pelo algoritmo de Pearce-Kelly: inserir uma aresta que já respeita
+    a ordem custa O(1); caso contrário só os nós entre as duas posições e
+    alcançáveis pela aresta são reordenados, e a mesma busca detecta ciclos.
+    `_pendentes` conta, por nó, os pré-requisitos ainda não concluídos.
+    """
+
+    def __init__(self, obter):
+        self._obter = obter
+        self._antes = {}
+        self._depois = {}
+        self._ordem = {}
+        self._proxima_posicao = 0
+        self._concluidas = set()
+        self._pendentes = {}
+
+    def __contains__(self, id_):
+        return id_ in self._ordem
+
+    # ----- arestas -----
+    def prerequisitos(self, id_):
+        """Ids dos pré-requisitos diretos de uma tarefa"""
+        return set(self._antes.get(id_, ()))
+
+    def adicionar(self, pre, id_):
+        """Liga `pre` como pré-requisito de `id_`, rejeitando ciclos"""
+        if pre == id_:
+            raise CicloDependencia("Uma tarefa não pode ser pré-requisito de si mesma")
+        self._garantir_no(pre)
+        try:
+            self._garantir_no(id_)
+            if pre in self._antes[id_]:
+                return
+            if self._ordem[id_] < self._ordem[pre]:
+                self._reordenar(pre, id_)
+        except (CicloDependencia, KeyError):
+            # Nós recém-criados e ainda sem ligações não ficam no grafo
+            for no in (pre, id_):
+                if no in self._ordem:
+                    self._podar(no)
+            raise
+
+        self._antes[id_].add(pre)
+        self._depois[pre].add(id_)
+        if pre not in self._concluidas:
+            self._pendentes[id_] += 1
+
+    def remover(self, pre, id_):
+        """Desfaz a ligação; a ordem atual continua válida"""
+        if pre not in self._antes.get(id_, ()):
+            return
+        self._antes[id_].discard(pre)
+        self._depois[pre].discard(id_)
+        if pre not in self._concluidas:
+            self._pendentes[id_] -= 1
+        self._podar(pre)
+        self._podar(id_)
+
+    def definir_prerequisitos(self, id_, prerequisitos):
+        """Troca os pré-requisitos de uma tarefa de forma atômica (ciclo ou id inexistente desfaz tudo)"""
+        atuais = self.prerequisitos(id_)
+        novos = set(prerequisitos)
+        adicionados = []
+        try:
+            for pre in novos - atuais:
+                self.adicionar(pre, id_)
+                adicionados.append(pre)
+        except (CicloDependencia, KeyError):
+            for pre in adicionados:
+                self.remover(pre, id_)
+            raise
+        for pre in atuais - novos:
+            self.remover(pre, id_)
+
+    # ----- sincronização com as tarefas -----
+    def sincronizar(self, id_, tarefa, anterior=None):
+        """Ouvinte de TarefasSessao: atualiza status ou remove a tarefa do grafo"""
+        if id_ not in self._ordem:
+            return
+        if tarefa is None:
+            self._remover_no(id_)
+            return
+        concluida = tarefa['status'] == 'Concluída'
+        if concluida == (id_ in self._concluidas):
+            return
+        delta = -1 if concluida else 1
+        if concluida:
+            self._concluidas.add(id_)
+        else:
+            self._concluidas.discard(id_)
+        for sucessor in self._depois[id_]:
+            self._pendentes[sucessor] += delta
+
+    # ----- consultas -----
+    def bloqueada(self, id_):
+        """True se a tarefa tem pré-requisitos ainda abertos"""
+        return self._pendentes.get(id_, 0) > 0
+
+    def bloqueios(self, id_):
+        """Pré-requisitos abertos que impedem a tarefa de começar"""
+        return [pre for pre in self._antes.get(id_, ()) if pre not in self._concluidas]
+
+    def ordem_topologica(self):
+        """Ids do grafo em uma ordem em que todo pré-requisito vem antes"""
+        return sorted(self._ordem, key=self._ordem.__getitem__)
+
+    def caminho_critico(self, id_):
+        """Cadeia de pré-requisitos abertos mais longa (em horas) até `id_`.
+
+        Percorre só os ancestrais de `id_`, na ordem topológica mantida.
+        Retorna (lista de ids terminando em `id_`, horas totais).
+        """
+        ancestrais = {id_}
+        pilha = [id_]
+        while pilha:
+            for pre in self._antes.get(pilha.pop(), ()):
+                if pre not in ancestrais and pre not in self._concluidas:
+                    ancestrais.add(pre)
+                    pilha.append(pre)
+
+        distancia = {}
+        anterior = {}
+        for no in sorted(ancestrais, key=lambda n: self._ordem.get(n, -1)):
+            melhor, escolhido = 0.0, None
+            for pre in self._antes.get(no, ()):
+                if pre in ancestrais and distancia[pre] > melhor:
+                    melhor, escolhido = distancia[pre], pre
+            distancia[no] = melhor + self._esforco(no)
+            anterior[no] = escolhido
+
+        caminho = []
+        no = id_
+        while no is not None:
+            caminho.append(no)
+            no = anterior[no]
+        caminho.reverse()
+        return caminho, distancia[id_]
+
+    # ----- internos -----
+    def _esforco(self, id_):
+        tarefa = self._obter(id_)
+        if tarefa is None or tarefa['status'] == 'Concluída':
+            return 0.0
+        return float(tarefa.get('esforco', ESFORCO_PADRAO))
+
+    def _garantir_no(self, id_):
+        if id_ in self._ordem:
+            return
+        tarefa = self._obter(id_)
+        if tarefa is None:
+            raise KeyError(id_)
+        self._antes[id_] = set()
+        self._depois[id_] = set()
+        self._pendentes[id_] = 0
+        self._ordem[id_] = self._proxima_posicao
+        self._proxima_posicao += 1
+        if tarefa['status'] == 'Concluída':
+            self._concluidas.add(id_)
+
+    def _podar(self, id_):
+        # Nós sem nenhuma ligação saem do grafo para ele crescer só com as arestas
+        if not self._antes[id_] and not self._depois[id_]:
+            for estrutura in (self._antes, self._depois, self._ordem, self._pendentes):
+                del estrutura[id_]
+            self._concluidas.discard(id_)
+
+    def _remover_no(self, id_):
+        for pre in list(self._antes[id_]):
+            self.remover(pre, id_)
+        if id_ in self._ordem:
+            for sucessor in list(self._depois[id_]):
+                self.remover(id_, sucessor)
+
+    def _reordenar(self, pre, id_):
+        # Pearce-Kelly: a aresta pre -> id_ viola a ordem (id_ está antes de pre)
+        limite_inferior = self._ordem[id_]
+        limite_superior = self._ordem[pre]
+
+        adiante = self._alcancaveis(id_, self._depois, lambda o: o <= limite_superior)
+        if pre in adiante:
+            raise CicloDependencia("Esse pré-requisito criaria um ciclo de dependências")
+        atras = self._alcancaveis(pre, self._antes, lambda o: o > limite_inferior)
+
+        chave = self._ordem.__getitem__
+        nos = sorted(atras, key=chave) + sorted(adiante, key=chave)
+        posicoes = sorted(self._ordem[no] for no in nos)
+        for no, posicao in zip(nos, posicoes):
+            self._ordem[no] = posicao
+
+    def _alcancaveis(self, inicio, vizinhos, dentro):
+        visitados = {inicio}
+        pilha = [inicio]
+        while pilha:
+            for proximo in vizinhos[pilha.pop()]:
+                if proximo not in visitados and dentro(self._ordem[proximo]):
+                    visitados.add(proximo)
+                    pilha.append(proximo)
+        return visitados
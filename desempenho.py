@@ -0,0 +1,127 @@
+import builtins
+import contextlib
+import importlib
+import logging
+import sys
+import threading
+import time
+
+# Estado de processo: o Streamlit reexecuta app.py a cada interação, mas este
+# módulo fica em sys.modules, então os tempos abaixo valem para o processo todo.
+_lock = threading.Lock()
+_lock_medicao = threading.Lock()
+_tempos_importacao = {}
+_primeiro_elemento = {}
+_aquecimento = None
+_importacoes_medidas = False
+
+logger = logging.getLogger(__name__)
+
+
+# ============= IMPORTAÇÃO PREGUIÇOSA =============
+def importar(nome):
+    """Importa um módulo sob demanda, registrando o tempo da primeira carga"""
+    # import_module (e não sys.modules) para esperar uma carga em andamento
+    # na thread de aquecimento em vez de receber um módulo pela metade
+    ja_carregado = nome in sys.modules
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome)
+    if ja_carregado:
+        return modulo
+    _registrar_importacao(nome, time.perf_counter() - inicio)
+    return modulo
+
+
+@contextlib.contextmanager
+def medir_importacoes():
+    """Registra o tempo de cada import feito diretamente no bloco.
+
+    Só mede na primeira execução do processo, quando os módulos ainda não
+    estão em sys.modules; os imports feitos por dentro de um módulo contam no
+    tempo dele. Nas execuções seguintes o bloco roda sem instrumentação.
+    """
+    global _importacoes_medidas
+    if _importacoes_medidas:
+        yield
+        return
+    with _lock_medicao:
+        if _importacoes_medidas:
+            yield
+            return
+        original = builtins.__import__
+        thread = threading.get_ident()
+        profundidade = 0
+
+        def importar_medindo(nome, globals=None, locals=None, fromlist=(), level=0):
+            nonlocal profundidade
+            if profundidade or level or nome in sys.modules or threading.get_ident() != thread:
+                return original(nome, globals, locals, fromlist, level)
+            profundidade += 1
+            inicio = time.perf_counter()
+            try:
+                modulo = original(nome, globals, locals, fromlist, level)
+            finally:
+                profundidade -= 1
+            _registrar_importacao(nome, time.perf_counter() - inicio)
+            return modulo
+
+        builtins.__import__ = importar_medindo
+        try:
+            yield
+        finally:
+            builtins.__import__ = original
+            _importacoes_medidas = True
+
+
+def aquecer(*nomes):
+    """Pré-carrega módulos pesados em uma thread de fundo (uma vez por processo)"""
+    global _aquecimento
+    with _lock:
+        if _aquecimento is not None:
+            return _aquecimento
+
+        def _carregar():
+            for nome in nomes:
+                try:
+                    importar(nome)
+                except ImportError:
+                    logger.exception("Falha ao pré-carregar %s", nome)
+
+        _aquecimento = threading.Thread(target=_carregar, name="aquecimento", daemon=True)
+        _aquecimento.start()
+        return _aquecimento
+
+
+def aquecido():
+    """True quando o aquecimento já terminou (os módulos podem ser usados sem esperar)"""
+    return _aquecimento is not None and not _aquecimento.is_alive()
+
+
+def _registrar_importacao(nome, duracao):
+    with _lock:
+        _tempos_importacao.setdefault(nome, {
+            'segundos': duracao,
+            'thread': threading.current_thread().name,
+        })
+    logger.info("Módulo %s importado em %.3fs", nome, duracao)
+
+
+# ============= TEMPO ATÉ O PRIMEIRO ELEMENTO =============
+def marcar_primeiro_elemento(inicio):
+    """Registra o tempo entre o início do script e o primeiro elemento visível"""
+    duracao = time.perf_counter() - inicio
+    with _lock:
+        if not _primeiro_elemento:
+            _primeiro_elemento['primeira_execucao'] = duracao
+            logger.info("Primeiro elemento em %.3fs (partida a frio)", duracao)
+        _primeiro_elemento['ultima_execucao'] = duracao
+    return duracao
+
+
+def relatorio_inicializacao():
+    """Retorna os tempos medidos de importação e de primeiro elemento"""
+    with _lock:
+        return {
+            'importacoes': {nome: dict(info) for nome, info in _tempos_importacao.items()},
+            'primeiro_elemento': dict(_primeiro_elemento),
+        }
@@ -0,0 +1,116 @@
+from collections import Counter
+
+from desempenho import importar
+
+# plotly e pandas são importados só quando um gráfico é de fato criado
+
+
+def criar_chart_elegante(tarefas, categorias):
+    """Cria um treemap elegante.
+
+    Agrupa pelo id da categoria (resolvido em `categorias`, uma TabelaCategorias)
+    e só busca os nomes das combinações já agregadas.
+    """
+    pd = importar('pandas')
+    px = importar('plotly.express')
+    grupos = Counter(
+        (categorias.resolver(t['categoria']), t['prioridade'], t['status']) for t in tarefas
+    )
+    df_filtrado = pd.DataFrame(
+        [
+            {'categoria': categorias.nome(id_), 'prioridade': prioridade, 'status': status, 'contagem': contagem}
+            for (id_, prioridade, status), contagem in grupos.items()
+        ]
+    )
+    
+    cores_prioridade = {
+        'Alta': '#EF4444',
+        'Média': '#F97316',
+        'Baixa': '#06B6D4',
+    }
+    
+    fig = px.treemap(
+        df_filtrado,
+        path=[px.Constant("Tarefas"), 'categoria', 'prioridade', 'status'],
+        values='contagem',
+        color='prioridade',
+        color_discrete_map=cores_prioridade,
+    )
+    
+    fig.update_layout(
+        margin=dict(t=40, l=20, r=20, b=20),
+        height=500,
+        paper_bgcolor='rgba(15, 23, 42, 0.9)',
+        font=dict(
+            color='#F1F5F9',
+            family='system-ui, -apple-system, sans-serif',
+            size=13
+        ),
+    )
+    
+    fig.update_traces(
+        textinfo="label+value",
+        textfont=dict(
+            size=12,
+            color='white',
+            family='system-ui, -apple-system, sans-serif'
+        ),
+        textposition='middle center',
+        marker=dict(
+            line=dict(width=2, color='rgba(15, 23, 42, 0.95)')
+        )
+    )
+    
+    return fig
+
+
+def estilizar_chart_historico(fig):
+    """Aplica o tema escuro dos gráficos de histórico"""
+    fig.update_layout(
+        margin=dict(t=40, l=20, r=20, b=20),
+        height=350,
+        paper_bgcolor='rgba(15, 23, 42, 0.9)',
+        plot_bgcolor='rgba(15, 23, 42, 0.9)',
+        font=dict(
+            color='#F1F5F9',
+            family='system-ui, -apple-system, sans-serif',
+            size=13
+        ),
+        legend_title_text='',
+        xaxis_title=None,
+        yaxis_title=None,
+    )
+    return fig
+
+
+def criar_chart_burndown(serie):
+    """Cria o gráfico de burndown a partir da série diária do rollup"""
+    px = importar('plotly.express')
+    dias = [ponto['dia'] for ponto in serie]
+    fig = px.line(
+        {
+            'dia': dias * 2,
+            'tarefas': [ponto['abertas'] for ponto in serie] + [ponto['atrasadas'] for ponto in serie],
+            'serie': ['Em aberto'] * len(serie) + ['Atrasadas'] * len(serie),
+        },
+        x='dia',
+        y='tarefas',
+        color='serie',
+        color_discrete_map={'Em aberto': '#7C3AED', 'Atrasadas': '#EF4444'},
+    )
+    return estilizar_chart_historico(fig)
+
+
+def criar_chart_velocidade(semanas):
+    """Cria o gráfico de velocidade (tarefas concluídas por semana)"""
+    px = importar('plotly.express')
+    fig = px.bar(
+        {
+            'semana': [semana for semana, _ in semanas],
+            'concluidas': [total for _, total in semanas],
+        },
+        x='semana',
+        y='concluidas',
+        color_discrete_sequence=['#10B981'],
+    )
+    return estilizar_chart_historico(fig)
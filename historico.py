@@ -0,0 +1,136 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+# Colunas de cada linha do rollup diário, por (dia, id da categoria); ATRASADAS
+# guarda a variação do número de tarefas atrasadas naquele dia
+CRIADAS, CONCLUIDAS, EXCLUIDAS, ATRASADAS = range(4)
+COLUNAS = ('criadas', 'concluidas', 'excluidas', 'atrasadas')
+
+
+def _dia(instante):
+    return instante.toordinal()
+
+
+def contribuicoes(tarefa, excluida_em=None):
+    """Células do rollup que uma tarefa ocupa: (dia, id da categoria, coluna, valor).
+
+    `excluida_em` fecha o histórico de uma tarefa aberta excluída nesse instante.
+    """
+    categoria = tarefa['categoria']
+    yield _dia(tarefa['criada_em']), categoria, CRIADAS, 1
+    if tarefa['status'] == 'Concluída':
+        fechada = _dia(tarefa['concluida_em'] or tarefa['criada_em'])
+        yield fechada, categoria, CONCLUIDAS, 1
+    elif excluida_em is not None:
+        fechada = _dia(excluida_em)
+        yield fechada, categoria, EXCLUIDAS, 1
+    else:
+        fechada = None
+    # Como na interface, fica atrasada a partir do dia seguinte ao prazo e
+    # deixa de estar no dia em que é concluída ou excluída
+    atrasada_desde = _dia(tarefa['prazo']) + 1
+    if fechada is None or fechada > atrasada_desde:
+        yield atrasada_desde, categoria, ATRASADAS, 1
+        if fechada is not None:
+            yield fechada, categoria, ATRASADAS, -1
+
+
+class RollupDiario:
+    """Contadores por (dia, id da categoria): criadas, concluídas, excluídas e variação das atrasadas"""
+
+    def __init__(self, tarefas=()):
+        self.linhas = defaultdict(lambda: [0, 0, 0, 0])
+        for tarefa in tarefas:
+            self.somar(tarefa, 1)
+
+    def somar(self, tarefa, sinal, excluida_em=None):
+        """Soma (sinal=1) ou retira (sinal=-1) a contribuição de uma tarefa"""
+        for dia, categoria, coluna, valor in contribuicoes(tarefa, excluida_em):
+            self.linhas[(dia, categoria)][coluna] += sinal * valor
+
+
+class HistoricoProgresso:
+    """Histórico de progresso da sessão mantido por rollups incrementais.
+
+    O rollup das tarefas da base é compartilhado; a sessão guarda só o delta
+    das suas mutações. Cada mutação retira a contribuição da versão anterior
+    da tarefa e soma a da nova, então os gráficos leem O(dias x categorias)
+    linhas sem revisitar as tarefas.
+    As linhas são chaveadas pelo id da categoria, que não muda ao renomear;
+    após uma mesclagem, o filtro recebe também os ids mesclados.
+    """
+
+    def __init__(self, base=None):
+        self._base = base
+        self._delta = RollupDiario()
+
+    def sincronizar(self, id_, tarefa, anterior):
+        """Ouvinte de TarefasSessao: atualiza o delta"""
+        if anterior is not None:
+            self._delta.somar(anterior, -1)
+        if tarefa is not None:
+            self._delta.somar(tarefa, 1)
+        elif anterior is not None:
+            # Exclusão não reescreve o passado: a tarefa conta até o dia em que foi excluída
+            self._delta.somar(anterior, 1, excluida_em=datetime.now())
+
+    def linhas(self, categorias=None):
+        """Linhas combinadas base + delta: {(dia, id da categoria): [contadores]}"""
+        combinadas = defaultdict(lambda: [0, 0, 0, 0])
+        for rollup in (self._base, self._delta):
+            if rollup is None:
+                continue
+            for chave, valores in rollup.linhas.items():
+                if categorias is not None and chave[1] not in categorias:
+                    continue
+                linha = combinadas[chave]
+                for coluna, valor in enumerate(valores):
+                    linha[coluna] += valor
+        return combinadas
+
+    def serie_diaria(self, inicio, fim, categorias=None):
+        """Série de burndown entre `inicio` e `fim` (datas, inclusive).
+
+        Retorna uma lista de dicts com o dia, os contadores do dia e as tarefas
+        em aberto e atrasadas ao fim do dia.
+        """
+        por_dia = defaultdict(lambda: [0, 0, 0, 0])
+        for (dia, _), valores in self.linhas(categorias).items():
+            linha = por_dia[dia]
+            for coluna, valor in enumerate(valores):
+                linha[coluna] += valor
+
+        inicio_ord, fim_ord = inicio.toordinal(), fim.toordinal()
+        abertas = atrasadas = 0
+        for dia, valores in por_dia.items():
+            if dia < inicio_ord:
+                abertas += valores[CRIADAS] - valores[CONCLUIDAS] - valores[EXCLUIDAS]
+                atrasadas += valores[ATRASADAS]
+
+        serie = []
+        for dia in range(inicio_ord, fim_ord + 1):
+            valores = por_dia.get(dia, (0, 0, 0, 0))
+            abertas += valores[CRIADAS] - valores[CONCLUIDAS] - valores[EXCLUIDAS]
+            atrasadas += valores[ATRASADAS]
+            serie.append({
+                'dia': date.fromordinal(dia),
+                'criadas': valores[CRIADAS],
+                'concluidas': valores[CONCLUIDAS],
+                'abertas': abertas,
+                'atrasadas': atrasadas,
+            })
+        return serie
+
+    def velocidade_semanal(self, inicio, fim, categorias=None):
+        """Tarefas concluídas por semana (segunda a domingo) no período"""
+        semanas = defaultdict(int)
+        inicio_ord, fim_ord = inicio.toordinal(), fim.toordinal()
+        for (dia, _), valores in self.linhas(categorias).items():
+            if inicio_ord <= dia <= fim_ord and valores[CONCLUIDAS]:
+                segunda = date.fromordinal(dia - date.fromordinal(dia).weekday())
+                semanas[segunda] += valores[CONCLUIDAS]
+        primeira = inicio - timedelta(days=inicio.weekday())
+        return [
+            (semana, semanas.get(semana, 0))
+            for semana in (primeira + timedelta(weeks=i) for i in range((fim - primeira).days // 7 + 1))
+        ]
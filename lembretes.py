@@ -0,0 +1,342 @@
+import heapq
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+
+# Aviso de "vence em breve" disparado este tempo antes do fim do dia do prazo
+ANTECEDENCIA_LEMBRETE = timedelta(days=1)
+
+EM_BREVE = 'vence_em_breve'
+VENCIDA = 'vencida'
+
+Lembrete = namedtuple('Lembrete', 'sessao id titulo prazo tipo')
+
+logger = logging.getLogger(__name__)
+
+
+# ============= DESTINOS =============
+class CaixaEntrada:
+    """Destino em memória: cada sessão drena seus lembretes como toasts.
+
+    Só guarda lembretes de sessões abertas; `descartar` solta a caixa quando
+    a sessão termina.
+    """
+
+    # Recebe uma cópia de cada lembrete da base por sessão (os demais destinos, uma só)
+    por_sessao = True
+
+    def __init__(self, limite_por_sessao=50):
+        self._lock = threading.Lock()
+        self._limite = limite_por_sessao
+        self._caixas = {}
+
+    def __call__(self, lembrete):
+        with self._lock:
+            caixa = self._caixas.get(lembrete.sessao)
+            if caixa is not None:
+                caixa.append(lembrete)
+
+    def abrir(self, sessao):
+        """Cria a caixa de uma sessão nova"""
+        with self._lock:
+            self._caixas.setdefault(sessao, deque(maxlen=self._limite))
+
+    def descartar(self, sessao):
+        """Solta a caixa de uma sessão encerrada"""
+        with self._lock:
+            self._caixas.pop(sessao, None)
+
+    def drenar(self, sessao):
+        """Retorna e remove os lembretes pendentes de uma sessão"""
+        with self._lock:
+            caixa = self._caixas.get(sessao)
+            if not caixa:
+                return []
+            lembretes = list(caixa)
+            caixa.clear()
+        return lembretes
+
+
+class ArquivoLembretes:
+    """Destino que acrescenta cada lembrete como uma linha JSON em um arquivo local"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+
+    def __call__(self, lembrete):
+        registro = dict(lembrete._asdict(), prazo=lembrete.prazo.isoformat())
+        with self._lock, open(self.caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+
+class WebhookLembretes:
+    """Stub de webhook: monta o payload e só registra no log o POST que faria"""
+
+    def __init__(self, url):
+        self.url = url
+
+    def __call__(self, lembrete):
+        payload = dict(lembrete._asdict(), prazo=lembrete.prazo.isoformat())
+        logger.info("POST %s %s", self.url, json.dumps(payload, ensure_ascii=False))
+
+
+# ============= SERVIÇO =============
+class ServicoLembretes:
+    """Agenda lembretes de prazo em um min-heap atendido por uma thread.
+
+    Cada entrada é (instante, seq, chave, versão, lembrete). Editar, concluir
+    ou excluir uma tarefa só troca a versão da chave e, se ainda houver
+    o que avisar, empurra novas entradas: O(log n). Entradas de versões
+    antigas são descartadas quando chegam ao topo. A thread dorme até o
+    instante do topo e só é acordada antes se algo mais cedo for agendado.
+
+    As tarefas de uma base compartilhada são agendadas uma única vez, com
+    chave (base, id); ao disparar, o lembrete é entregue a cada sessão
+    daquela base que não tenha a própria versão da tarefa, nos destinos
+    `por_sessao`; os outros destinos (arquivo, webhook) recebem o lembrete da
+    base uma única vez, com sessao=None. Uma sessão só
+    agenda as tarefas que alterou (`_sessoes[sessao]` = base e ids
+    sombreados). Quando a sessão é coletada, as chaves dela são canceladas e
+    os destinos com estado por sessão a descartam; a base sai do heap quando
+    a última sessão dela termina.
+    """
+
+    def __init__(self, destinos=()):
+        self._destinos = []
+        self._destinos_sessao = []
+        self._destinos_gerais = []
+        for destino in destinos:
+            self.adicionar_destino(destino)
+        self._heap = []
+        self._versoes = {}
+        self._vivas = {}
+        self._seq = 0
+        self._obsoletas = 0
+        self._bases = {}
+        self._sessoes = {}
+        self._encerradas = deque()
+        self._condicao = threading.Condition()
+        self._thread = None
+        self._ativo = False
+
+    def __len__(self):
+        return len(self._versoes)
+
+    def adicionar_destino(self, destino):
+        """Registra um callable que recebe cada Lembrete disparado"""
+        self._destinos.append(destino)
+        if getattr(destino, 'por_sessao', False):
+            self._destinos_sessao.append(destino)
+        else:
+            self._destinos_gerais.append(destino)
+
+    def iniciar(self):
+        """Inicia a thread de disparo (idempotente)"""
+        with self._condicao:
+            if self._thread is not None:
+                return
+            self._ativo = True
+            self._thread = threading.Thread(target=self._executar, name="lembretes", daemon=True)
+            self._thread.start()
+
+    def parar(self):
+        """Encerra a thread de disparo"""
+        with self._condicao:
+            self._ativo = False
+            self._condicao.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ----- sessões -----
+    def registrar_sessao(self, sessao, base_id, tarefas_base, tarefas_sessao):
+        """Liga uma sessão aos lembretes da sua base e acompanha as mutações dela.
+
+        A base é agendada só na primeira sessão que a usa. Lembretes da base
+        que já dispararam são reentregues à sessão nova, só nos destinos
+        `por_sessao`. Quando
+        `tarefas_sessao` for coletada, tudo o que é da sessão é liberado.
+        """
+        with self._condicao:
+            encerradas = self._liberar_encerradas()
+            base = self._bases.get(base_id)
+            if base is None:
+                ids = []
+                for tarefa in tarefas_base:
+                    if tarefa['status'] != 'Concluída':
+                        self._agendar(base_id, tarefa, time.time())
+                        ids.append(tarefa['id'])
+                base = self._bases[base_id] = {'sessoes': set(), 'ids': ids, 'disparados': {}}
+            base['sessoes'].add(sessao)
+            self._sessoes[sessao] = (base_id, set())
+            atrasados = [lembrete._replace(sessao=sessao) for lembrete in base['disparados'].values()]
+        self._descartar_nos_destinos(encerradas)
+        for destino in self._destinos_sessao:
+            destino.abrir(sessao)
+        self._entregar([(lembrete, self._destinos_sessao) for lembrete in atrasados])
+        tarefas_sessao.inscrever(self.ouvinte(sessao))
+        weakref.finalize(tarefas_sessao, self._encerrar_depois, sessao)
+
+    def encerrar_sessao(self, sessao):
+        """Cancela as chaves da sessão e solta o estado dela nos destinos"""
+        with self._condicao:
+            self._liberar(sessao)
+        self._descartar_nos_destinos([sessao])
+
+    # ----- agendamento -----
+    def agendar(self, sessao, tarefa, agora=None):
+        """Agenda (ou reagenda) os lembretes de uma tarefa aberta"""
+        with self._condicao:
+            self._agendar(sessao, tarefa, time.time() if agora is None else agora)
+
+    def cancelar(self, sessao, id_):
+        """Cancela os lembretes de uma tarefa concluída ou excluída"""
+        with self._condicao:
+            self._invalidar((sessao, id_))
+
+    def ouvinte(self, sessao):
+        """Callback para TarefasSessao.inscrever de uma sessão"""
+        def _sincronizar(id_, tarefa, anterior=None):
+            with self._condicao:
+                registro = self._sessoes.get(sessao)
+                if registro is not None:
+                    # A versão da sessão passa a valer no lugar da versão da base
+                    registro[1].add(id_)
+                if tarefa is None:
+                    self._invalidar((sessao, id_))
+                else:
+                    self._agendar(sessao, tarefa, time.time())
+        return _sincronizar
+
+    # ----- internos -----
+    def _encerrar_depois(self, sessao):
+        # Chamado pelo coletor de lixo, talvez no meio de outra operação deste
+        # serviço na mesma thread: só enfileira e acorda a thread de disparo
+        self._encerradas.append(sessao)
+        with self._condicao:
+            self._condicao.notify()
+
+    def _liberar_encerradas(self):
+        # Chamado com self._condicao adquirida
+        encerradas = []
+        while self._encerradas:
+            sessao = self._encerradas.popleft()
+            self._liberar(sessao)
+            encerradas.append(sessao)
+        return encerradas
+
+    def _liberar(self, sessao):
+        registro = self._sessoes.pop(sessao, None)
+        if registro is None:
+            return
+        base_id, sombreadas = registro
+        for id_ in sombreadas:
+            self._invalidar((sessao, id_))
+        base = self._bases[base_id]
+        base['sessoes'].discard(sessao)
+        if not base['sessoes']:
+            # Ninguém mais usa essa base: os lembretes dela saem do heap
+            for id_ in base['ids']:
+                self._invalidar((base_id, id_))
+            del self._bases[base_id]
+
+    def _descartar_nos_destinos(self, sessoes):
+        for destino in self._destinos_sessao:
+            for sessao in sessoes:
+                destino.descartar(sessao)
+
+    def _agendar(self, sessao, tarefa, agora):
+        # Chamado com self._condicao adquirida
+        chave = (sessao, tarefa['id'])
+        if tarefa['status'] == 'Concluída':
+            self._invalidar(chave)
+            return
+        prazo = tarefa['prazo']
+        # Como na interface, a tarefa só está atrasada depois do dia do prazo
+        fim_do_dia = datetime.combine(prazo.date() + timedelta(days=1), datetime.min.time())
+        instante_prazo = fim_do_dia.timestamp()
+        instante_breve = (fim_do_dia - ANTECEDENCIA_LEMBRETE).timestamp()
+
+        entradas = []
+        if instante_prazo > agora:
+            entradas.append((max(instante_breve, agora), EM_BREVE))
+        entradas.append((instante_prazo, VENCIDA))
+
+        self._invalidar(chave)
+        self._seq += 1
+        versao = self._versoes[chave] = self._seq
+        self._vivas[chave] = len(entradas)
+        topo = self._heap[0][0] if self._heap else None
+        for instante, tipo in entradas:
+            lembrete = Lembrete(sessao, tarefa['id'], tarefa['titulo'], prazo, tipo)
+            self._seq += 1
+            heapq.heappush(self._heap, (instante, self._seq, chave, versao, lembrete))
+        if topo is None or self._heap[0][0] < topo:
+            self._condicao.notify()
+
+    def _invalidar(self, chave):
+        # Deixa as entradas antigas no heap; sem versão válida elas viram obsoletas
+        self._versoes.pop(chave, None)
+        self._obsoletas += self._vivas.pop(chave, 0)
+        self._compactar_se_preciso()
+
+    def _compactar_se_preciso(self):
+        # Limpeza amortizada: reconstrói o heap quando metade dele é obsoleta
+        if self._obsoletas > 32 and self._obsoletas * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if self._versoes.get(e[2]) == e[3]]
+            heapq.heapify(self._heap)
+            self._obsoletas = 0
+
+    def _vencidas(self):
+        # Retorna pares (lembrete, destinos)
+        agora = time.time()
+        disparar = []
+        while self._heap and self._heap[0][0] <= agora:
+            _, _, chave, versao, lembrete = heapq.heappop(self._heap)
+            if self._versoes.get(chave) != versao:
+                self._obsoletas -= 1
+                continue
+            self._vivas[chave] -= 1
+            if not self._vivas[chave]:
+                del self._vivas[chave]
+                del self._versoes[chave]
+            base = self._bases.get(chave[0])
+            if base is None:
+                disparar.append((lembrete, self._destinos))
+                continue
+            # Lembrete da base: uma vez nos destinos gerais e uma cópia por
+            # sessão que não sombreia a tarefa nos destinos por sessão
+            lembrete = lembrete._replace(sessao=None)
+            base['disparados'][lembrete.id] = lembrete
+            disparar.append((lembrete, self._destinos_gerais))
+            for sessao in base['sessoes']:
+                if lembrete.id not in self._sessoes[sessao][1]:
+                    disparar.append((lembrete._replace(sessao=sessao), self._destinos_sessao))
+        return disparar
+
+    def _entregar(self, disparar):
+        for lembrete, destinos in disparar:
+            for destino in destinos:
+                try:
+                    destino(lembrete)
+                except Exception:
+                    logger.exception("Falha ao entregar lembrete em %r", destino)
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                if not self._ativo:
+                    return
+                encerradas = self._liberar_encerradas()
+                disparar = self._vencidas()
+                if not disparar and not encerradas:
+                    espera = self._heap[0][0] - time.time() if self._heap else None
+                    self._condicao.wait(espera)
+                    continue
+            self._descartar_nos_destinos(encerradas)
+            self._entregar(disparar)
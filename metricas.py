@@ -0,0 +1,40 @@
+from datetime import datetime
+
+# Horizonte da lista "Foco da Semana"
+HORIZONTE_URGENTES = 7
+
+
+def calcular_metricas(tarefas):
+    """Calcula métricas principais"""
+    concluidas = em_progresso = pendentes = total = 0
+    for t in tarefas:
+        total += 1
+        if t['status'] == 'Concluída':
+            concluidas += 1
+        elif t['status'] == 'Em Progresso':
+            em_progresso += 1
+        elif t['status'] == 'Pendente':
+            pendentes += 1
+    percentual_conclusao = (concluidas / total * 100) if total > 0 else 0
+
+    return {
+        'concluidas': concluidas,
+        'em_progresso': em_progresso,
+        'pendentes': pendentes,
+        'total': total,
+        'percentual': percentual_conclusao
+    }
+
+
+def tarefas_urgentes(tarefas, hoje=None, horizonte=HORIZONTE_URGENTES):
+    """Tarefas abertas que vencem em até `horizonte` dias: lista de (tarefa, dias restantes)"""
+    hoje = hoje or datetime.now().date()
+    urgentes = []
+    for t in tarefas:
+        if t['status'] == 'Concluída':
+            continue
+        dias_restantes = (t['prazo'].date() - hoje).days
+        if dias_restantes <= horizonte:
+            urgentes.append((t, dias_restantes))
+    urgentes.sort(key=lambda item: item[0]['prazo'])
+    return urgentes
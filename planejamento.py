@@ -0,0 +1,274 @@
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from itertools import accumulate
+from types import MappingProxyType
+
+ESFORCO_PADRAO = 2.0
+HORAS_POR_DIA_PADRAO = 4.0
+
+# Prioridade desloca o prazo efetivo: "Alta" é planejada como se vencesse um dia antes
+ANTECEDENCIA_PRIORIDADE = {'Alta': 1, 'Média': 0, 'Baixa': 0}
+PESO_PRIORIDADE = {'Alta': 0, 'Média': 1, 'Baixa': 2}
+
+
+class SequenciaEDF:
+    """Lista ordenada de (chave, esforço) com somas acumuladas recalculadas sob demanda.
+
+    A chave é (prazo efetivo, peso da prioridade, id). Inserir ou retirar uma
+    entrada só marca as somas como sujas a partir daquela posição; a próxima
+    consulta recalcula a partir da menor posição afetada.
+    """
+
+    __slots__ = ('chaves', 'esforcos', '_acumulado', '_sujo_desde')
+
+    def __init__(self, entradas=()):
+        entradas = sorted(entradas)
+        self.chaves = [chave for chave, _ in entradas]
+        self.esforcos = [esforco for _, esforco in entradas]
+        self._acumulado = []
+        self._sujo_desde = 0
+
+    def __len__(self):
+        return len(self.chaves)
+
+    def __iter__(self):
+        return zip(self.chaves, self.esforcos)
+
+    def inserir(self, chave, esforco):
+        """Insere uma entrada na posição da chave"""
+        posicao = bisect_left(self.chaves, chave)
+        self.chaves.insert(posicao, chave)
+        self.esforcos.insert(posicao, esforco)
+        self._sujo_desde = min(self._sujo_desde, posicao)
+
+    def retirar(self, chave):
+        """Remove a entrada da chave e retorna o esforço dela"""
+        posicao = bisect_left(self.chaves, chave)
+        del self.chaves[posicao]
+        esforco = self.esforcos.pop(posicao)
+        self._sujo_desde = min(self._sujo_desde, posicao)
+        return esforco
+
+    def esforco(self, chave):
+        """Esforço da entrada com essa chave"""
+        return self.esforcos[bisect_left(self.chaves, chave)]
+
+    def ate(self, chave):
+        """Esforço somado das entradas com chave <= `chave`"""
+        posicao = bisect_right(self.chaves, chave)
+        if not posicao:
+            return 0.0
+        self.recalcular()
+        return self._acumulado[posicao - 1]
+
+    def total(self):
+        """Esforço somado de todas as entradas"""
+        self.recalcular()
+        return self._acumulado[-1] if self._acumulado else 0.0
+
+    def recalcular(self):
+        """Refaz as somas acumuladas a partir da menor posição alterada"""
+        inicio = self._sujo_desde
+        total = len(self.chaves)
+        if inicio >= total and len(self._acumulado) == total:
+            return
+        base = self._acumulado[inicio - 1] if inicio else 0.0
+        del self._acumulado[inicio:]
+        self._acumulado.extend(accumulate(self.esforcos[inicio:], initial=base))
+        del self._acumulado[inicio]
+        self._sujo_desde = total
+
+
+class PlanoBase:
+    """Plano das tarefas abertas da base compartilhada, montado uma vez por processo.
+
+    Só leitura: as somas acumuladas são calculadas na construção, então as
+    sessões podem consultá-lo de várias threads sem copiar nada.
+    """
+
+    __slots__ = ('sequencia', 'por_id', 'prazos')
+
+    def __init__(self, tarefas=()):
+        entradas = []
+        por_id = {}
+        prazos = {}
+        for tarefa in tarefas:
+            if tarefa['status'] == 'Concluída':
+                continue
+            chave = _chave(tarefa)
+            por_id[tarefa['id']] = chave
+            prazos[tarefa['id']] = tarefa['prazo'].date()
+            entradas.append((chave, _esforco(tarefa)))
+        self.sequencia = SequenciaEDF(entradas)
+        self.sequencia.recalcular()
+        self.por_id = MappingProxyType(por_id)
+        self.prazos = MappingProxyType(prazos)
+
+
+class PlanejadorEstudos:
+    """Plano de estudos diário por prazo mais cedo primeiro (EDF).
+
+    As tarefas abertas ficam em ordem de (prazo efetivo, peso da prioridade,
+    id). Como os dias são preenchidos em sequência com `horas_por_dia`, o
+    plano inteiro sai das somas acumuladas de esforço: a tarefa de chave k
+    termina após `fim(k)` horas a partir de hoje.
+
+    O `PlanoBase` compartilhado não é copiado. A sessão guarda só o seu
+    delta: as tarefas da base que ela alterou, concluiu ou excluiu
+    (`_retiradas`) e as versões próprias das tarefas (`_proprias`), cada um
+    com as suas somas acumuladas. Assim fim(k) = base até k - retiradas até k
+    + próprias até k, e uma edição custa O(log n + m) para m edições da sessão.
+    """
+
+    def __init__(self, base=None, horas_por_dia=HORAS_POR_DIA_PADRAO, hoje=None):
+        self.horas_por_dia = horas_por_dia
+        self.hoje = hoje or date.today()
+        self._base = base if base is not None else PlanoBase()
+        self._retiradas = {}
+        self._seq_retiradas = SequenciaEDF()
+        self._proprias = {}
+        self._seq_proprias = SequenciaEDF()
+        self._prazos = {}
+        self._inviaveis = None
+
+    def __len__(self):
+        return len(self._base.sequencia) - len(self._seq_retiradas) + len(self._seq_proprias)
+
+    # ----- construção e atualização -----
+    def carregar(self, tarefas):
+        """Reconstrói o plano a partir de todas as tarefas, descartando o delta"""
+        self._base = PlanoBase(tarefas)
+        self._retiradas = {}
+        self._seq_retiradas = SequenciaEDF()
+        self._proprias = {}
+        self._seq_proprias = SequenciaEDF()
+        self._prazos = {}
+        self._inviaveis = None
+
+    def sincronizar(self, id_, tarefa, anterior=None):
+        """Ouvinte de TarefasSessao: aplica uma única alteração ao plano"""
+        if tarefa is None or tarefa['status'] == 'Concluída':
+            self.remover(id_)
+        else:
+            self.atualizar(tarefa)
+
+    def atualizar(self, tarefa):
+        """Insere ou reposiciona uma tarefa aberta"""
+        self._retirar(tarefa['id'])
+        chave = _chave(tarefa)
+        self._seq_proprias.inserir(chave, _esforco(tarefa))
+        self._proprias[tarefa['id']] = chave
+        self._prazos[tarefa['id']] = tarefa['prazo'].date()
+        self._inviaveis = None
+
+    def remover(self, id_):
+        """Retira uma tarefa do plano (concluída ou excluída)"""
+        if self._retirar(id_):
+            self._inviaveis = None
+
+    def definir_horas(self, horas_por_dia):
+        """Altera o orçamento diário; as somas acumuladas continuam válidas"""
+        if horas_por_dia != self.horas_por_dia:
+            self.horas_por_dia = horas_por_dia
+            self._inviaveis = None
+
+    def definir_hoje(self, hoje):
+        """Move o início do plano (virada do dia)"""
+        if hoje != self.hoje:
+            self.hoje = hoje
+            self._inviaveis = None
+
+    # ----- consultas -----
+    def conclusao(self, id_):
+        """Data prevista de conclusão de uma tarefa aberta (ou None)"""
+        chave = self._proprias.get(id_)
+        if chave is None:
+            if id_ in self._retiradas:
+                return None
+            chave = self._base.por_id.get(id_)
+            if chave is None:
+                return None
+        return self.hoje + timedelta(days=self._dia_final(self._fim(chave)))
+
+    def inviaveis(self):
+        """Tarefas que não terminam até o prazo: lista de (id, conclusão, prazo)"""
+        if self._inviaveis is None:
+            hoje_ord = self.hoje.toordinal()
+            resultado = []
+            fim = 0.0
+            for chave, esforco in self._ordem():
+                fim += esforco
+                id_ = chave[2]
+                prazo = self._prazo(id_)
+                dia = self._dia_final(fim)
+                if hoje_ord + dia > prazo.toordinal():
+                    resultado.append((id_, self.hoje + timedelta(days=dia), prazo))
+            self._inviaveis = resultado
+        return self._inviaveis
+
+    def plano(self, dias):
+        """Plano dos próximos `dias`: lista de (data, [(id, horas), ...])"""
+        horas = self.horas_por_dia
+        por_dia = [[] for _ in range(dias)]
+        inicio = 0.0
+        for chave, esforco in self._ordem():
+            fim = inicio + esforco
+            dia = int(inicio // horas)
+            while dia < dias and dia * horas < fim:
+                alocado = min(fim, (dia + 1) * horas) - max(inicio, dia * horas)
+                if alocado > 0:
+                    por_dia[dia].append((chave[2], alocado))
+                dia += 1
+            if fim >= dias * horas:
+                break
+            inicio = fim
+        return [(self.hoje + timedelta(days=dia), itens) for dia, itens in enumerate(por_dia)]
+
+    def total_horas(self):
+        """Esforço total das tarefas abertas"""
+        return self._base.sequencia.total() - self._seq_retiradas.total() + self._seq_proprias.total()
+
+    # ----- internos -----
+    def _retirar(self, id_):
+        # Tarefa própria sai do delta; tarefa da base passa a ser sombreada pela sessão
+        chave = self._proprias.pop(id_, None)
+        if chave is not None:
+            self._seq_proprias.retirar(chave)
+            del self._prazos[id_]
+            return True
+        chave = self._base.por_id.get(id_)
+        if chave is None or id_ in self._retiradas:
+            return False
+        self._retiradas[id_] = chave
+        self._seq_retiradas.inserir(chave, self._base.sequencia.esforco(chave))
+        return True
+
+    def _fim(self, chave):
+        return self._base.sequencia.ate(chave) - self._seq_retiradas.ate(chave) + self._seq_proprias.ate(chave)
+
+    def _ordem(self):
+        # Tarefas abertas em ordem EDF: base sem as sombreadas, intercalada com as próprias
+        retiradas = self._retiradas
+        base = ((chave, esforco) for chave, esforco in self._base.sequencia if chave[2] not in retiradas)
+        return heapq.merge(base, self._seq_proprias)
+
+    def _prazo(self, id_):
+        prazo = self._prazos.get(id_)
+        return prazo if prazo is not None else self._base.prazos[id_]
+
+    def _dia_final(self, fim):
+        # Índice (a partir de hoje) do dia em que a tarefa termina
+        return max(math.ceil(fim / self.horas_por_dia - 1e-9) - 1, 0)
+
+
+def _chave(tarefa):
+    prioridade = tarefa['prioridade']
+    prazo_efetivo = tarefa['prazo'].date().toordinal() - ANTECEDENCIA_PRIORIDADE.get(prioridade, 0)
+    return (prazo_efetivo, PESO_PRIORIDADE.get(prioridade, 1), tarefa['id'])
+
+
+def _esforco(tarefa):
+    esforco = tarefa.get('esforco')
+    return float(ESFORCO_PADRAO if esforco is None else esforco)
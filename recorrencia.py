@@ -0,0 +1,241 @@
+import calendar
+import heapq
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+
+from planejamento import ESFORCO_PADRAO
+from tarefas import IDS_CATEGORIAS_EXEMPLO
+
+DIARIA, SEMANAL, MENSAL = 'diaria', 'semanal', 'mensal'
+FREQUENCIAS = {DIARIA: "Diariamente", SEMANAL: "Semanalmente", MENSAL: "Mensalmente"}
+UNIDADES = {DIARIA: "dia(s)", SEMANAL: "semana(s)", MENSAL: "mês(es)"}
+
+# Ocorrências abertas de até uma semana atrás ainda aparecem como atrasadas
+JANELA_ATRASO = timedelta(days=7)
+# Até onde a lista de tarefas projeta as rotinas
+JANELA_LISTAGEM = timedelta(days=90)
+
+# (id, titulo, categoria, prioridade, frequencia, intervalo, esforço em horas, descricao)
+REGRAS_EXEMPLO = (
+    (1, 'Lista de Geometria Analítica', 'Matemática', 'Média', SEMANAL, 1, 2.0,
+     'Exercícios semanais do capítulo em curso'),
+)
+
+
+def _adicionar_meses(dia, meses):
+    mes = dia.month - 1 + meses
+    ano = dia.year + mes // 12
+    mes = mes % 12 + 1
+    return date(ano, mes, min(dia.day, calendar.monthrange(ano, mes)[1]))
+
+
+def datas(regra, inicio, fim):
+    """Datas das ocorrências de uma regra entre `inicio` e `fim` (inclusive), em ordem.
+
+    Calcula direto a primeira ocorrência da janela, sem percorrer as anteriores.
+    """
+    primeiro = regra['inicio'].date()
+    ultimo = min(fim, regra['fim'].date()) if regra.get('fim') else fim
+    intervalo = max(int(regra.get('intervalo', 1)), 1)
+    inicio = max(inicio, primeiro)
+    if inicio > ultimo:
+        return
+
+    if regra['frequencia'] == MENSAL:
+        passo = (inicio.year - primeiro.year) * 12 + inicio.month - primeiro.month
+        k = max(passo // intervalo - 1, 0)
+        while True:
+            dia = _adicionar_meses(primeiro, k * intervalo)
+            if dia > ultimo:
+                return
+            if dia >= inicio:
+                yield dia
+            k += 1
+    else:
+        passo = intervalo * (7 if regra['frequencia'] == SEMANAL else 1)
+        k = -((primeiro - inicio).days // passo)
+        dia = primeiro + timedelta(days=k * passo)
+        while dia <= ultimo:
+            yield dia
+            dia += timedelta(days=passo)
+
+
+def descrever(regra):
+    """Texto curto da regra, ex.: "a cada 2 semana(s) até 10/12" """
+    intervalo = int(regra.get('intervalo', 1))
+    texto = FREQUENCIAS[regra['frequencia']] if intervalo == 1 else f"A cada {intervalo} {UNIDADES[regra['frequencia']]}"
+    if regra.get('fim'):
+        texto += f" até {regra['fim']:%d/%m/%Y}"
+    return texto
+
+
+def criar_regras_exemplo(agora=None):
+    """Regras de exemplo começando na segunda-feira da semana atual"""
+    agora = agora or datetime.now()
+    segunda = datetime.combine(agora.date() - timedelta(days=agora.weekday()), datetime.min.time())
+    return tuple(
+        MappingProxyType({
+            'id': id_,
+            'titulo': titulo,
+            'categoria': IDS_CATEGORIAS_EXEMPLO[categoria],
+            'prioridade': prioridade,
+            'frequencia': frequencia,
+            'intervalo': intervalo,
+            'inicio': segunda,
+            'fim': None,
+            'esforco': esforco,
+            'descricao': descricao,
+        })
+        for id_, titulo, categoria, prioridade, frequencia, intervalo, esforco, descricao in REGRAS_EXEMPLO
+    )
+
+
+class AgendaRecorrente:
+    """Regras de recorrência guardadas uma vez, com ocorrências geradas sob demanda.
+
+    Uma ocorrência só existe enquanto a janela consultada a contém. Concluir,
+    editar ou excluir uma ocorrência grava apenas a exceção daquela data em
+    `_excecoes[(regra, dia)]` (None = excluída). As ocorrências sem exceção
+    saem de geradores ordenados por data; as alteradas ficam em `_alteradas`,
+    ordenadas pelo prazo efetivo, e só as que caem na janela são montadas.
+    Os dois fluxos são intercalados com heapq.merge.
+    """
+
+    def __init__(self, regras_base=()):
+        self._regras = {regra['id']: regra for regra in regras_base}
+        self._excecoes = {}
+        # (prazo efetivo, regra, dia) de cada ocorrência alterada, em ordem
+        self._alteradas = []
+        self._max_id = max(self._regras, default=0)
+
+    def __len__(self):
+        return len(self._regras)
+
+    def __iter__(self):
+        return iter(self._regras.values())
+
+    # ----- regras -----
+    def regra(self, regra_id):
+        """Regra pelo id (ou None)"""
+        return self._regras.get(regra_id)
+
+    def adicionar_regra(self, regra):
+        """Cadastra uma regra nova e retorna seu id"""
+        self._max_id += 1
+        self._regras[self._max_id] = MappingProxyType(dict(regra, id=self._max_id))
+        return self._max_id
+
+    def remover_regra(self, regra_id):
+        """Encerra a rotina e descarta as exceções dela"""
+        self._regras.pop(regra_id, None)
+        self._excecoes = {chave: valor for chave, valor in self._excecoes.items() if chave[0] != regra_id}
+        self._alteradas = [item for item in self._alteradas if item[1] != regra_id]
+
+    # ----- ocorrências -----
+    def ocorrencias(self, inicio, fim):
+        """Ocorrências (dicts de tarefa) com prazo entre as datas `inicio` e `fim`, por prazo"""
+        fluxos = [self._intactas(regra, inicio, fim) for regra in self._regras.values()]
+        de = bisect_left(self._alteradas, (datetime.combine(inicio, datetime.min.time()),))
+        ate = bisect_left(self._alteradas, (datetime.combine(fim + timedelta(days=1), datetime.min.time()),))
+        fluxos.append(
+            self._montar(self._regras[regra_id], date.fromordinal(dia), self._excecoes[(regra_id, dia)])
+            for _, regra_id, dia in self._alteradas[de:ate]
+        )
+        return heapq.merge(*fluxos, key=lambda o: o['prazo'])
+
+    def obter(self, id_):
+        """Monta uma ocorrência a partir do id "regra@AAAA-MM-DD" (ou None)"""
+        chave = self._chave(id_)
+        if chave is None or chave[0] not in self._regras or self._excecoes.get(chave, {}) is None:
+            return None
+        regra, dia = self._regras[chave[0]], date.fromordinal(chave[1])
+        if next(datas(regra, dia, dia), None) is None:
+            return None
+        return self._montar(regra, dia, self._excecoes.get(chave))
+
+    def atualizar(self, id_, **campos):
+        """Grava a exceção de uma única ocorrência"""
+        chave = self._chave(id_)
+        if self.obter(id_) is None:
+            return None
+        self._desindexar(chave)
+        self._excecoes[chave] = {**self._excecoes.get(chave, {}), **campos}
+        insort(self._alteradas, (self._prazo_efetivo(chave), *chave))
+        return self.obter(id_)
+
+    def remover(self, id_):
+        """Exclui uma única ocorrência"""
+        if self.obter(id_) is None:
+            return False
+        chave = self._chave(id_)
+        self._desindexar(chave)
+        self._excecoes[chave] = None
+        return True
+
+    # ----- internos -----
+    def _prazo_efetivo(self, chave):
+        campos = self._excecoes[chave]
+        if campos and campos.get('prazo') is not None:
+            return campos['prazo']
+        return datetime.combine(date.fromordinal(chave[1]), self._regras[chave[0]]['inicio'].time())
+
+    def _desindexar(self, chave):
+        if self._excecoes.get(chave) is None:
+            return
+        item = (self._prazo_efetivo(chave), *chave)
+        del self._alteradas[bisect_left(self._alteradas, item)]
+
+    def _intactas(self, regra, inicio, fim):
+        excecoes = self._excecoes
+        for dia in datas(regra, inicio, fim):
+            if (regra['id'], dia.toordinal()) not in excecoes:
+                yield self._montar(regra, dia, None)
+
+    @staticmethod
+    def _chave(id_):
+        if not isinstance(id_, str) or '@' not in id_:
+            return None
+        regra_id, dia = id_.split('@', 1)
+        try:
+            return int(regra_id), date.fromisoformat(dia).toordinal()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _montar(regra, dia, campos):
+        ocorrencia = {
+            'id': f"{regra['id']}@{dia.isoformat()}",
+            'regra_id': regra['id'],
+            'titulo': regra['titulo'],
+            'categoria': regra['categoria'],
+            'prioridade': regra['prioridade'],
+            'status': 'Pendente',
+            'prazo': datetime.combine(dia, regra['inicio'].time()),
+            'esforco': regra.get('esforco') or ESFORCO_PADRAO,
+            'descricao': regra.get('descricao', ''),
+        }
+        if campos:
+            ocorrencia.update(campos)
+        return ocorrencia
+
+
+def regras_de_json(brutas):
+    """Converte regras lidas de JSON (datas em ISO) para o formato da agenda"""
+    regras = []
+    for id_, bruta in enumerate(brutas, start=1):
+        regra = {
+            'id': id_,
+            'categoria': 'Sem Categoria',
+            'prioridade': 'Média',
+            'frequencia': SEMANAL,
+            'intervalo': 1,
+            'fim': None,
+            'descricao': '',
+        }
+        regra.update(bruta)
+        for campo in ('inicio', 'fim'):
+            if isinstance(regra.get(campo), str):
+                regra[campo] = datetime.fromisoformat(regra[campo])
+        regras.append(MappingProxyType(regra))
+    return regras
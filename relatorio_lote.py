@@ -0,0 +1,202 @@
+"""Gera relatórios estáticos (HTML e JSON) de vários quadros de tarefas sem o Streamlit.
+
+Cada arquivo de entrada é uma lista JSON de tarefas (um aluno ou turma), ou um
+objeto {"tarefas": [...], "recorrencias": [...]}. Os arquivos são processados
+em paralelo por um pool de processos.
+
+Uso:
+    python relatorio_lote.py alunos/*.json --saida relatorios --processos 8
+"""
+import argparse
+import html
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from types import MappingProxyType
+
+from categorias import TabelaCategorias
+from graficos import criar_chart_elegante
+from metricas import HORIZONTE_URGENTES, calcular_metricas, tarefas_urgentes
+from recorrencia import JANELA_ATRASO, AgendaRecorrente, regras_de_json
+from tarefas import ler_quadro_json
+
+ESTILO_HTML = """
+body { background: #0F172A; color: #F1F5F9; font-family: system-ui, -apple-system, sans-serif; margin: 2rem; }
+h1, h2 { color: #E9D5FF; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #334155; padding: 0.5rem 1rem; text-align: left; }
+.atrasada { color: #EF4444; } .hoje { color: #EF4444; } .breve { color: #F97316; } .semana { color: #06B6D4; }
+"""
+
+
+# ============= RELATÓRIO DE UM ARQUIVO =============
+def descrever_urgencia(dias_restantes):
+    """Classe CSS e texto de uma tarefa urgente, como no Foco da Semana"""
+    if dias_restantes < 0:
+        return 'atrasada', f"🚨 ATRASADA - {abs(dias_restantes)} dias atrás"
+    if dias_restantes == 0:
+        return 'hoje', "🔴 VENCE HOJE"
+    if dias_restantes <= 3:
+        return 'breve', f"🟠 VENCE EM {dias_restantes} DIAS"
+    return 'semana', f"🔵 VENCE EM {dias_restantes} DIAS"
+
+
+def nomes_unicos(arquivos):
+    """Nome de saída de cada arquivo: o nome do arquivo, ou o caminho relativo se ele se repete.
+
+    turmaA/joao.json e turmaB/joao.json viram turmaA__joao e turmaB__joao; o
+    mesmo arquivo passado duas vezes ganha um sufixo numérico. A comparação
+    ignora maiúsculas para não sobrescrever em sistemas de arquivos que também ignoram.
+    """
+    caminhos = [Path(arquivo).resolve() for arquivo in arquivos]
+    repetidos = Counter(caminho.stem.lower() for caminho in caminhos)
+    comum = Path(os.path.commonpath([caminho.parent for caminho in caminhos])) if caminhos else None
+
+    nomes, usados = [], set()
+    for caminho in caminhos:
+        nome = caminho.stem
+        if repetidos[nome.lower()] > 1:
+            nome = '__'.join(caminho.relative_to(comum).with_suffix('').parts)
+        unico, indice = nome, 2
+        while unico.lower() in usados:
+            unico = f"{nome}-{indice}"
+            indice += 1
+        usados.add(unico.lower())
+        nomes.append(unico)
+    return nomes
+
+
+def gerar_relatorio(caminho, pasta_saida, hoje, nome=None):
+    """Calcula métricas, urgentes e treemap de um arquivo e grava <nome>.json/.html"""
+    caminho = Path(caminho)
+    nome = nome or caminho.stem
+    tarefas, recorrencias = ler_quadro_json(caminho)
+    regras = regras_de_json(recorrencias)
+    # O arquivo traz nomes de categoria; internamente tudo é agrupado pelo id
+    categorias = TabelaCategorias()
+    for tarefa in tarefas:
+        tarefa['categoria'] = categorias.id_para(tarefa['categoria'])
+    regras = [MappingProxyType(dict(regra, categoria=categorias.id_para(regra['categoria']))) for regra in regras]
+    metricas = calcular_metricas(tarefas)
+    # Rotinas só contribuem com as ocorrências que caem na janela das urgentes
+    agenda = AgendaRecorrente(regras)
+    urgentes = tarefas_urgentes(chain(
+        tarefas,
+        agenda.ocorrencias(hoje - JANELA_ATRASO, hoje + timedelta(days=HORIZONTE_URGENTES))
+    ), hoje)
+    distribuicao = Counter((t['categoria'], t['prioridade'], t['status']) for t in tarefas)
+
+    dados = {
+        'arquivo': str(caminho),
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'referencia': hoje.isoformat(),
+        'metricas': metricas,
+        'urgentes': [
+            {
+                'id': t['id'],
+                'titulo': t['titulo'],
+                'categoria': categorias.nome(t['categoria']),
+                'prioridade': t['prioridade'],
+                'prazo': t['prazo'].date().isoformat(),
+                'dias_restantes': dias,
+            }
+            for t, dias in urgentes
+        ],
+        'distribuicao': [
+            {'categoria': categorias.nome(categoria), 'prioridade': prioridade, 'status': status, 'contagem': contagem}
+            for (categoria, prioridade, status), contagem in sorted(distribuicao.items())
+        ],
+    }
+
+    treemap = criar_chart_elegante(tarefas, categorias).to_html(full_html=False, include_plotlyjs='cdn') if tarefas else ''
+    itens_urgentes = "".join(
+        f"<li class='{classe}'>{texto}: <strong>{html.escape(t['titulo'])}</strong> ({html.escape(categorias.nome(t['categoria']))})</li>"
+        for t, dias in urgentes
+        for classe, texto in [descrever_urgencia(dias)]
+    ) or f"<li>✅ Nenhuma tarefa urgente para os próximos {HORIZONTE_URGENTES} dias!</li>"
+    pagina = f"""<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><title>🎯 {html.escape(nome)}</title><style>{ESTILO_HTML}</style></head>
+<body>
+<h1>🎯 Math Study Manager - {html.escape(nome)}</h1>
+<p>Referência: {hoje:%d/%m/%Y} • {metricas['percentual']:.0f}% concluído</p>
+<table>
+<tr><th>Total</th><th>Pendentes</th><th>Em Progresso</th><th>Concluídas</th></tr>
+<tr><td>{metricas['total']}</td><td>{metricas['pendentes']}</td><td>{metricas['em_progresso']}</td><td>{metricas['concluidas']}</td></tr>
+</table>
+<h2>🔥 Foco da Semana - Tarefas Urgentes</h2>
+<ul>{itens_urgentes}</ul>
+<h2>📂 Distribuição por Categorias</h2>
+{treemap}
+</body></html>
+"""
+
+    # Só grava depois de tudo calculado, para uma falha não deixar relatório pela metade
+    with open(pasta_saida / f"{nome}.json", 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    with open(pasta_saida / f"{nome}.html", 'w', encoding='utf-8') as arquivo:
+        arquivo.write(pagina)
+
+    return {'arquivo': str(caminho), 'nome': nome, **metricas, 'urgentes': len(urgentes)}
+
+
+# ============= LOTE =============
+def gerar_lote(arquivos, pasta_saida, processos=None, hoje=None):
+    """Gera os relatórios de todos os arquivos em paralelo; retorna (resumos, erros)"""
+    pasta_saida = Path(pasta_saida)
+    pasta_saida.mkdir(parents=True, exist_ok=True)
+    hoje = hoje or date.today()
+    arquivos = list(arquivos)
+
+    resumos, erros = [], []
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        futuros = {
+            pool.submit(gerar_relatorio, arquivo, pasta_saida, hoje, nome): arquivo
+            for arquivo, nome in zip(arquivos, nomes_unicos(arquivos))
+        }
+        for futuro in as_completed(futuros):
+            try:
+                resumos.append(futuro.result())
+            except Exception as erro:
+                erros.append({'arquivo': str(futuros[futuro]), 'erro': repr(erro)})
+    resumos.sort(key=lambda resumo: resumo['nome'])
+
+    with open(pasta_saida / 'indice.json', 'w', encoding='utf-8') as arquivo:
+        json.dump({'relatorios': resumos, 'erros': erros}, arquivo, ensure_ascii=False, indent=2)
+
+    linhas = "".join(
+        f"<tr><td><a href='{html.escape(r['nome'])}.html'>{html.escape(r['nome'])}</a></td>"
+        f"<td>{r['total']}</td><td>{r['percentual']:.0f}%</td><td>{r['urgentes']}</td></tr>"
+        for r in resumos
+    )
+    with open(pasta_saida / 'index.html', 'w', encoding='utf-8') as arquivo:
+        arquivo.write(
+            f"<!DOCTYPE html><html lang='pt-BR'><head><meta charset='utf-8'><title>🎯 Relatórios</title>"
+            f"<style>{ESTILO_HTML}</style></head><body><h1>🎯 Relatórios - {hoje:%d/%m/%Y}</h1>"
+            f"<table><tr><th>Quadro</th><th>Total</th><th>Concluído</th><th>Urgentes</th></tr>{linhas}</table>"
+            f"</body></html>"
+        )
+    return resumos, erros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera relatórios HTML/JSON de vários arquivos de tarefas")
+    parser.add_argument('arquivos', nargs='+', help="arquivos JSON de tarefas (um por aluno ou turma)")
+    parser.add_argument('--saida', default='relatorios', help="pasta de saída (padrão: relatorios)")
+    parser.add_argument('--processos', type=int, default=os.cpu_count(), help="tamanho do pool de processos")
+    parser.add_argument('--hoje', type=date.fromisoformat, default=None, help="data de referência AAAA-MM-DD")
+    args = parser.parse_args(argv)
+
+    resumos, erros = gerar_lote(args.arquivos, args.saida, args.processos, args.hoje)
+    print(f"✅ {len(resumos)} relatório(s) gerado(s) em {args.saida}")
+    for erro in erros:
+        print(f"❌ {erro['arquivo']}: {erro['erro']}", file=sys.stderr)
+    return 1 if erros else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+import json
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+# ============= DADOS DE EXEMPLO =============
+# (id, titulo, categoria, prioridade, status, dias até o prazo, dias desde a criação,
+#  esforço em horas, descricao)
+TAREFAS_EXEMPLO = (
+    (1, 'Estudar Cálculo II - Integrais', 'Matemática', 'Alta', 'Em Progresso', 2, 12, 6.0,
+     'Revisão completa de integrais impróprias e técnicas de integração'),
+    (2, 'Projeto IC - Análise de Dados', 'Projeto IC', 'Alta', 'Em Progresso', 7, 30, 12.0,
+     'Implementação do pipeline de análise e visualização'),
+    (3, 'Revisar Álgebra Linear', 'Matemática', 'Média', 'Pendente', 5, 8, 4.0,
+     'Foco em transformações lineares e autovalores'),
+    (4, 'Relatório de Pesquisa', 'Projeto IC', 'Alta', 'Pendente', -1, 21, 5.0,
+     'Escrita e revisão final do relatório'),
+    (5, 'Exercícios de Geometria Analítica', 'Matemática', 'Baixa', 'Pendente', 15, 3, 3.0,
+     'Capítulos 3-5 do livro de texto'),
+    (6, 'Apresentação IC', 'Projeto IC', 'Média', 'Concluída', -2, 25, 2.0,
+     'Apresentação dos resultados preliminares'),
+)
+
+CATEGORIAS_EXEMPLO = ('Matemática', 'Projeto IC')
+# Ids na ordem de CATEGORIAS_EXEMPLO, como a TabelaCategorias os atribui
+IDS_CATEGORIAS_EXEMPLO = {nome: id_ for id_, nome in enumerate(CATEGORIAS_EXEMPLO, start=1)}
+
+CAMPOS_DATA = ('prazo', 'criada_em', 'iniciada_em', 'concluida_em')
+
+
+# ============= BASE COMPARTILHADA =============
+class BaseTarefas:
+    """Conjunto imutável de tarefas compartilhado por todas as sessões do processo"""
+
+    __slots__ = ('tarefas', 'indice', 'max_id')
+
+    def __init__(self, tarefas):
+        self.tarefas = tuple(MappingProxyType(dict(t)) for t in tarefas)
+        self.indice = MappingProxyType({t['id']: t for t in self.tarefas})
+        self.max_id = max(self.indice, default=0)
+
+
+def criar_base_exemplo(agora=None):
+    """Monta a base de exemplo com prazos relativos a `agora`"""
+    agora = agora or datetime.now()
+    return BaseTarefas(
+        {
+            'id': id_,
+            'titulo': titulo,
+            'categoria': IDS_CATEGORIAS_EXEMPLO[categoria],
+            'prioridade': prioridade,
+            'status': status,
+            'prazo': agora + timedelta(days=dias),
+            'esforco': esforco,
+            'descricao': descricao,
+            'criada_em': agora - timedelta(days=criada_ha),
+            'iniciada_em': agora - timedelta(days=criada_ha) if status != 'Pendente' else None,
+            # A tarefa concluída de exemplo foi entregue no próprio prazo
+            'concluida_em': agora + timedelta(days=dias) if status == 'Concluída' else None,
+        }
+        for id_, titulo, categoria, prioridade, status, dias, criada_ha, esforco, descricao in TAREFAS_EXEMPLO
+    )
+
+
+# ============= SOBREPOSIÇÃO DA SESSÃO =============
+class TarefasSessao:
+    """Visão copy-on-write das tarefas de uma sessão.
+
+    Lê da `BaseTarefas` compartilhada e guarda apenas o delta da sessão:
+    tarefas alteradas ou criadas em `_alteradas` e ids excluídos em
+    `_removidas`. A memória da sessão cresce com as edições, não com a base.
+    Tarefas da base são somente leitura; toda mutação passa pelos métodos,
+    que carimbam `criada_em`, `iniciada_em` e `concluida_em` e avisam os ouvintes inscritos com
+    `(id, tarefa, anterior)`: tarefa None = excluída, anterior None = criada.
+    """
+
+    # __weakref__ permite liberar recursos da sessão (ex.: lembretes) quando ela é coletada
+    __slots__ = ('_base', '_alteradas', '_removidas', '_novas', '_max_id', '_ouvintes', '__weakref__')
+
+    def __init__(self, base):
+        self._base = base
+        self._alteradas = {}
+        self._removidas = set()
+        self._novas = []
+        self._max_id = base.max_id
+        self._ouvintes = []
+
+    def __iter__(self):
+        alteradas = self._alteradas
+        removidas = self._removidas
+        for t in self._base.tarefas:
+            id_ = t['id']
+            if id_ in removidas:
+                continue
+            yield alteradas.get(id_, t)
+        for id_ in self._novas:
+            yield alteradas[id_]
+
+    def __len__(self):
+        return len(self._base.tarefas) + len(self._novas) - len(self._removidas)
+
+    def __contains__(self, id_):
+        return self.obter(id_) is not None
+
+    def obter(self, id_):
+        """Retorna a tarefa pelo id (ou None)"""
+        if id_ in self._removidas:
+            return None
+        tarefa = self._alteradas.get(id_)
+        if tarefa is None:
+            tarefa = self._base.indice.get(id_)
+        return tarefa
+
+    def inscrever(self, ouvinte):
+        """Registra um callback chamado a cada mutação"""
+        self._ouvintes.append(ouvinte)
+
+    def _notificar(self, id_, tarefa, anterior):
+        for ouvinte in self._ouvintes:
+            ouvinte(id_, tarefa, anterior)
+
+    def proximo_id(self):
+        """Próximo id livre, sem varrer as tarefas"""
+        return self._max_id + 1
+
+    def adicionar(self, tarefa):
+        """Adiciona uma tarefa nova ao delta da sessão"""
+        tarefa = dict(tarefa)
+        tarefa.setdefault('criada_em', datetime.now())
+        tarefa.setdefault('iniciada_em', tarefa['criada_em'] if tarefa['status'] != 'Pendente' else None)
+        tarefa.setdefault('concluida_em', tarefa['criada_em'] if tarefa['status'] == 'Concluída' else None)
+        id_ = tarefa['id']
+        self._alteradas[id_] = tarefa
+        self._novas.append(id_)
+        self._max_id = max(self._max_id, id_)
+        self._notificar(id_, tarefa, None)
+        return tarefa
+
+    def atualizar(self, id_, **campos):
+        """Atualiza campos de uma tarefa, copiando-a da base na primeira escrita"""
+        tarefa = self._alteradas.get(id_)
+        if tarefa is None:
+            anterior = self.obter(id_)
+            if anterior is None:
+                return None
+            tarefa = self._alteradas[id_] = dict(anterior)
+        else:
+            anterior = dict(tarefa)
+        status = campos.get('status', tarefa['status'])
+        if status != tarefa['status']:
+            # Cada transição de status fica carimbada na própria tarefa
+            agora = datetime.now()
+            campos['concluida_em'] = agora if status == 'Concluída' else None
+            if status == 'Pendente':
+                campos['iniciada_em'] = None
+            elif status == 'Em Progresso' or tarefa.get('iniciada_em') is None:
+                campos['iniciada_em'] = agora
+        tarefa.update(campos)
+        self._notificar(id_, tarefa, anterior)
+        return tarefa
+
+    def remover(self, id_):
+        """Exclui a tarefa da visão da sessão"""
+        anterior = self.obter(id_)
+        if anterior is None:
+            return False
+        if id_ in self._base.indice:
+            self._removidas.add(id_)
+            self._alteradas.pop(id_, None)
+        else:
+            del self._alteradas[id_]
+            self._novas.remove(id_)
+        self._notificar(id_, None, anterior)
+        return True
+
+
+# ============= ARQUIVOS =============
+def ler_quadro_json(caminho):
+    """Lê um quadro (lista JSON ou {"tarefas": [...], "recorrencias": [...]}).
+
+    Retorna (tarefas, recorrências brutas); as recorrências são convertidas
+    por `recorrencia.regras_de_json`. As categorias ficam como no arquivo
+    (nomes); `categorias.TabelaCategorias.id_para` os converte em ids.
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    recorrencias = []
+    if isinstance(dados, dict):
+        recorrencias = dados.get('recorrencias', [])
+        dados = dados.get('tarefas', [])
+
+    tarefas = []
+    for posicao, bruta in enumerate(dados, start=1):
+        tarefa = {
+            'id': posicao,
+            'categoria': 'Sem Categoria',
+            'prioridade': 'Média',
+            'status': 'Pendente',
+            'descricao': '',
+        }
+        tarefa.update(bruta)
+        for campo in CAMPOS_DATA:
+            if isinstance(tarefa.get(campo), str):
+                tarefa[campo] = datetime.fromisoformat(tarefa[campo])
+        tarefas.append(tarefa)
+    return tarefas, recorrencias
@@ -0,0 +1,398 @@
+"""Teste de carga: simula N sessões concorrentes do app.py e mede a escala.
+
+Sobe um servidor real (`streamlit run app.py`) em um processo à parte e abre
+N conexões websocket com ele, cada uma fazendo o papel de uma aba do
+navegador: pede execuções do script com o estado dos widgets (BackMsg) e lê
+os elementos que voltam (ForwardMsg). O servidor executa as sessões em
+threads próprias, de forma concorrente, com os recursos de
+`st.cache_resource` compartilhados; as sessões só se sobrepõem de verdade
+lá. As sessões misturam ações realistas (filtrar, concluir, editar, criar e
+trocar de aba) separadas por uma pausa de leitura e, para cada N, o
+relatório traz vazão, percentis de latência e o crescimento do RSS do
+processo do servidor por sessão.
+
+Uso:
+    python teste_carga.py --sessoes 1 2 4 8 16 --acoes 20 --saida carga.json
+    python teste_carga.py --sessoes 1 4 16 --comparar carga_anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+CAMINHO_APP = Path(__file__).with_name('app.py')
+
+# Peso de cada ação no sorteio
+MIX_ACOES = {
+    'filtrar': 4,
+    'trocar_aba': 3,
+    'concluir': 1,
+    'editar': 1,
+    'criar': 1,
+}
+
+TIMEOUT_EXECUCAO = 60
+TIMEOUT_SERVIDOR = 60
+TIPOS_WIDGET = ('button', 'selectbox', 'text_input')
+
+Widget = namedtuple('Widget', 'tipo id chave rotulo valor desabilitado')
+
+
+class FalhaAcao(Exception):
+    """A página não tinha o que a ação esperava (ex.: o formulário de edição)"""
+
+
+# ============= SERVIDOR =============
+def iniciar_servidor(porta):
+    """Sobe `streamlit run app.py` e espera o servidor responder"""
+    processo = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', str(CAMINHO_APP),
+            '--server.headless', 'true',
+            '--server.port', str(porta),
+            '--server.fileWatcherType', 'none',
+            # O cliente abaixo não é um navegador: não tem o cookie de XSRF
+            '--server.enableXsrfProtection', 'false',
+            '--browser.gatherUsageStats', 'false',
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + TIMEOUT_SERVIDOR
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"O servidor terminou com código {processo.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{porta}/_stcore/health", timeout=1):
+                return processo
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError(f"O servidor não respondeu em {TIMEOUT_SERVIDOR}s")
+
+
+def memoria_residente(pid):
+    """RSS atual de um processo em bytes (0 fora do Linux)"""
+    try:
+        with open(f"/proc/{pid}/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+# ============= SESSÃO REMOTA =============
+class SessaoRemota:
+    """Uma aba do navegador: conexão websocket e widgets da última execução.
+
+    Como o navegador, reenvia a cada execução o valor dos widgets que o
+    usuário alterou; botões são gatilhos enviados uma única vez. Campos de
+    formulário só vão junto do envio do formulário.
+    """
+
+    def __init__(self, conexao):
+        self._ws = conexao
+        self._valores = {}
+        self.widgets = []
+        self.excecoes = 0
+
+    def executar(self, gatilhos=(), formulario=None):
+        """Pede uma execução do script e espera ela terminar"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        mensagem = BackMsg()
+        estado = mensagem.rerun_script
+        estado.query_string = ''
+        for id_, valor in {**self._valores, **(formulario or {})}.items():
+            widget = estado.widget_states.widgets.add()
+            widget.id = id_
+            widget.string_value = valor
+        for id_ in gatilhos:
+            widget = estado.widget_states.widgets.add()
+            widget.id = id_
+            widget.trigger_value = True
+        self._ws.send(mensagem.SerializeToString())
+        self._receber()
+
+    def escolher(self, chave, valor):
+        """Muda o valor de um selectbox, como um clique do usuário"""
+        self._valores[self.widget(chave=chave).id] = valor
+        self.executar()
+
+    def widget(self, chave=None, rotulo=None, tipo=None):
+        """Primeiro widget da última execução com essa chave, rótulo ou tipo"""
+        for widget in self.buscar(chave, rotulo, tipo):
+            return widget
+        raise FalhaAcao(f"Widget não encontrado: {chave or rotulo}")
+
+    def buscar(self, chave=None, rotulo=None, tipo=None, prefixo=None):
+        """Widgets da última execução que batem com os filtros"""
+        return [
+            widget for widget in self.widgets
+            if (chave is None or widget.chave == chave)
+            and (rotulo is None or widget.rotulo == rotulo)
+            and (tipo is None or widget.tipo == tipo)
+            and (prefixo is None or (widget.chave or '').startswith(prefixo))
+        ]
+
+    def _receber(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        widgets = []
+        while True:
+            mensagem = ForwardMsg()
+            mensagem.ParseFromString(self._ws.recv(timeout=TIMEOUT_EXECUCAO))
+            tipo = mensagem.WhichOneof('type')
+            if tipo == 'delta' and mensagem.delta.WhichOneof('type') == 'new_element':
+                elemento = mensagem.delta.new_element
+                tipo_elemento = elemento.WhichOneof('type')
+                if tipo_elemento in TIPOS_WIDGET:
+                    widgets.append(_widget(tipo_elemento, getattr(elemento, tipo_elemento)))
+                elif tipo_elemento == 'exception':
+                    self.excecoes += 1
+            elif tipo == 'script_finished':
+                if mensagem.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    # st.rerun(): o servidor já emenda a próxima execução
+                    widgets = []
+                    continue
+                self.widgets = widgets
+                return
+
+
+def _widget(tipo, proto):
+    # Ids de widgets com key terminam em "-<key>"; sem key, em "-None"
+    chave = proto.id.split('-', 2)[2] if proto.id.count('-') >= 2 else None
+    return Widget(
+        tipo, proto.id, None if chave == 'None' else chave, proto.label,
+        getattr(proto, 'default', None), getattr(proto, 'disabled', False),
+    )
+
+
+# ============= AÇÕES =============
+def filtrar(sessao, rng):
+    sessao.escolher('filtro_status_tab2', rng.choice(["Todos", "Pendente", "Em Progresso", "Concluída"]))
+    sessao.escolher('filtro_prio_tab2', rng.choice(["Todas", "Alta", "Média", "Baixa"]))
+
+
+def trocar_aba(sessao, rng):
+    # Todas as abas executam a cada rerun; trocar de aba no navegador equivale a um rerun
+    sessao.executar()
+
+
+def concluir(sessao, rng):
+    botoes = [b for b in sessao.buscar(tipo='button', prefixo='concluir_') if not b.desabilitado]
+    if not botoes:
+        return criar(sessao, rng)
+    sessao.executar(gatilhos=[rng.choice(botoes).id])
+
+
+def editar(sessao, rng):
+    botoes = sessao.buscar(tipo='button', prefixo='editar_')
+    if not botoes:
+        return criar(sessao, rng)
+    sessao.executar(gatilhos=[rng.choice(botoes).id])
+    # O formulário de edição fica acima das abas: o clique só o liga para a
+    # execução seguinte, então o usuário precisa de mais uma até vê-lo
+    sessao.executar()
+    titulo = sessao.buscar(tipo='text_input', rotulo="✏️ Título da Tarefa")
+    salvar = sessao.buscar(tipo='button', rotulo="💾 Salvar Alterações")
+    if not titulo or not salvar:
+        raise FalhaAcao("O formulário de edição não apareceu")
+    sessao.executar(gatilhos=[salvar[0].id], formulario={titulo[0].id: f"{titulo[0].valor} *"[:100]})
+
+
+def criar(sessao, rng):
+    titulo = sessao.buscar(tipo='text_input', rotulo="✏️ Título da Tarefa")[-1]
+    enviar = sessao.widget(tipo='button', rotulo="✅ Criar Tarefa")
+    sessao.executar(gatilhos=[enviar.id], formulario={titulo.id: f"Tarefa de carga {rng.randrange(10**6)}"})
+
+
+ACOES = {
+    'filtrar': filtrar,
+    'trocar_aba': trocar_aba,
+    'concluir': concluir,
+    'editar': editar,
+    'criar': criar,
+}
+
+
+# ============= SESSÃO SIMULADA =============
+def simular_sessao(url, indice, acoes, semente, pausa, inicio_comum, fim_comum):
+    """Abre uma sessão, executa `acoes` ações sorteadas e devolve as medições.
+
+    A conexão só fecha depois que todas as sessões passam por `fim_comum`,
+    cuja ação mede a memória do servidor com todas ainda abertas.
+    """
+    from websockets.sync.client import connect
+
+    rng = random.Random(semente + indice)
+    nomes = list(MIX_ACOES)
+    pesos = list(MIX_ACOES.values())
+    latencias = {}
+    erros = 0
+
+    try:
+        inicio_comum.wait()
+        inicio = time.perf_counter()
+        with connect(url, subprotocols=['streamlit'], max_size=None, open_timeout=TIMEOUT_EXECUCAO) as conexao:
+            sessao = SessaoRemota(conexao)
+            sessao.executar()
+            latencias.setdefault('abrir', []).append(time.perf_counter() - inicio)
+
+            for _ in range(acoes):
+                # Tempo de leitura do usuário, fora da latência medida
+                time.sleep(rng.uniform(0, 2 * pausa))
+                nome = rng.choices(nomes, pesos)[0]
+                inicio = time.perf_counter()
+                try:
+                    ACOES[nome](sessao, rng)
+                except Exception:
+                    erros += 1
+                    continue
+                latencias.setdefault(nome, []).append(time.perf_counter() - inicio)
+            fim_comum.wait()
+    except Exception:
+        # Não deixa as outras sessões presas nas barreiras
+        inicio_comum.abort()
+        fim_comum.abort()
+        raise
+    return latencias, erros + sessao.excecoes
+
+
+def percentil(valores, p):
+    """Percentil por interpolação linear (p entre 0 e 100)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(ordenados) - 1)
+    return ordenados[abaixo] + (ordenados[acima] - ordenados[abaixo]) * (posicao - abaixo)
+
+
+def medir_nivel(url, pid, sessoes, acoes, semente, pausa):
+    """Roda `sessoes` sessões em paralelo contra o servidor e resume latência, vazão e memória"""
+    rss_inicial = memoria_residente(pid)
+    rss_final = []
+    inicio_comum = threading.Barrier(sessoes)
+    fim_comum = threading.Barrier(sessoes, action=lambda: rss_final.append(memoria_residente(pid)))
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessoes, thread_name_prefix='sessao') as pool:
+        resultados = list(pool.map(
+            lambda i: simular_sessao(url, i, acoes, semente, pausa, inicio_comum, fim_comum), range(sessoes)
+        ))
+    duracao = time.perf_counter() - inicio
+    rss_final = rss_final[0]
+
+    por_acao = {}
+    erros = 0
+    for latencias, erros_sessao in resultados:
+        erros += erros_sessao
+        for nome, valores in latencias.items():
+            por_acao.setdefault(nome, []).extend(valores)
+    todas = [v for nome, valores in por_acao.items() if nome != 'abrir' for v in valores]
+
+    return {
+        'sessoes': sessoes,
+        'acoes': len(todas),
+        'duracao_s': duracao,
+        'vazao_acoes_s': len(todas) / duracao if duracao else 0.0,
+        'latencia_ms': {
+            'p50': percentil(todas, 50) * 1000,
+            'p90': percentil(todas, 90) * 1000,
+            'p99': percentil(todas, 99) * 1000,
+            'media': statistics.fmean(todas) * 1000 if todas else 0.0,
+        },
+        'latencia_abrir_ms': percentil(por_acao.get('abrir', []), 50) * 1000,
+        'latencia_por_acao_p90_ms': {
+            nome: percentil(valores, 90) * 1000 for nome, valores in sorted(por_acao.items())
+        },
+        'rss_servidor_mb': rss_final / 2**20,
+        'rss_por_sessao_kb': max(rss_final - rss_inicial, 0) / sessoes / 1024,
+        'erros': erros,
+    }
+
+
+# ============= RELATÓRIO =============
+def imprimir_curva(pontos, anterior=None):
+    """Tabela da curva de escala, com a variação do p90 contra uma execução anterior"""
+    referencia = {p['sessoes']: p for p in (anterior or {}).get('pontos', [])}
+    print(f"{'sessões':>8} {'ações/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+          f"{'KB/sessão':>10} {'erros':>6} {'Δp90':>8}")
+    for ponto in pontos:
+        latencia = ponto['latencia_ms']
+        variacao = ''
+        if ponto['sessoes'] in referencia:
+            p90_anterior = referencia[ponto['sessoes']]['latencia_ms']['p90']
+            if p90_anterior:
+                variacao = f"{(latencia['p90'] / p90_anterior - 1) * 100:+.0f}%"
+        print(f"{ponto['sessoes']:>8} {ponto['vazao_acoes_s']:>9.1f} {latencia['p50']:>8.0f} "
+              f"{latencia['p90']:>8.0f} {latencia['p99']:>8.0f} {ponto['rss_por_sessao_kb']:>10.0f} "
+              f"{ponto['erros']:>6} {variacao:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a escala do app.py com sessões simuladas concorrentes")
+    parser.add_argument('--sessoes', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help="níveis de sessões concorrentes (padrão: 1 2 4 8 16)")
+    parser.add_argument('--acoes', type=int, default=20, help="ações por sessão (padrão: 20)")
+    parser.add_argument('--pausa', type=float, default=1.0,
+                        help="pausa média de leitura entre ações, em segundos (padrão: 1.0)")
+    parser.add_argument('--porta', type=int, default=8599, help="porta do servidor de teste (padrão: 8599)")
+    parser.add_argument('--semente', type=int, default=42, help="semente do sorteio de ações")
+    parser.add_argument('--saida', default=None, help="grava a curva em JSON")
+    parser.add_argument('--comparar', default=None, help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+
+    import streamlit
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+
+    servidor = iniciar_servidor(args.porta)
+    url = f"ws://localhost:{args.porta}/_stcore/stream"
+    try:
+        # Uma sessão descartada antes das medições carrega os módulos e os recursos compartilhados
+        simular_sessao(url, 0, 3, args.semente, 0.5, threading.Barrier(1), threading.Barrier(1))
+
+        pontos = []
+        for sessoes in args.sessoes:
+            pontos.append(medir_nivel(url, servidor.pid, sessoes, args.acoes, args.semente, args.pausa))
+            print(f"⏱️ {sessoes} sessão(ões) concluída(s)", file=sys.stderr)
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+    imprimir_curva(pontos, anterior)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'gerado_em': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'streamlit': streamlit.__version__,
+                'cpus': os.cpu_count(),
+                'acoes_por_sessao': args.acoes,
+                'pausa_s': args.pausa,
+                'mix_acoes': MIX_ACOES,
+                'pontos': pontos,
+            }, arquivo, ensure_ascii=False, indent=2)
+    return 1 if any(p['erros'] for p in pontos) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import pytest
+
+from categorias import TabelaCategorias
+
+
+def tarefa(categoria):
+    return {'categoria': categoria}
+
+
+def tabela_abc():
+    # A, B e C com 1, 2 e 3 tarefas
+    return TabelaCategorias(['A', 'B', 'C'], contagem={1: 1, 2: 2, 3: 3})
+
+
+def test_cadeia_de_mesclagens():
+    tabela = tabela_abc()
+    tabela.mesclar(1, 2)
+    tabela.mesclar(2, 3)
+
+    assert tabela.resolver(1) == tabela.resolver(2) == 3
+    assert tabela.nome(1) == tabela.nome(2) == 'C'
+    assert tabela.contagem(1) == tabela.contagem(3) == 6
+    assert tabela.equivalentes([1]) == tabela.equivalentes([3]) == {1, 2, 3}
+    assert list(tabela) == [3]
+    assert tabela.id_por_nome('A') is None and tabela.id_por_nome('B') is None
+    assert 1 in tabela and 2 in tabela
+
+    # Mesclar de novo no mesmo destino (por qualquer apelido) não muda nada
+    tabela.mesclar(1, 3)
+    assert tabela.contagem(3) == 6 and tabela.equivalentes([3]) == {1, 2, 3}
+
+
+def test_remover_destino_depois_de_esvaziar():
+    tabela = tabela_abc()
+    tabela.mesclar(1, 2)
+    tabela.mesclar(2, 3)
+    assert not tabela.remover(1)
+
+    for categoria in [1, 2, 2, 3, 3, 3]:
+        tabela.sincronizar(None, None, tarefa(categoria))
+    assert tabela.contagem(3) == 0
+    assert tabela.remover(2)
+
+    assert len(tabela) == 0
+    assert 1 not in tabela and 2 not in tabela and 3 not in tabela
+    assert tabela.nome(1) == '1'
+    assert tabela.equivalentes([1]) == {1}
+    # Os ids não são reaproveitados: tarefas antigas não caem na categoria nova
+    assert tabela.adicionar('A') == 4
+    assert tabela.resolver(1) == 1 and tabela.contagem(4) == 0
+
+
+def test_contagem_ao_mover_tarefas_entre_ids_mesclados():
+    tabela = TabelaCategorias(['A', 'B', 'C', 'D'], contagem={1: 2, 2: 1, 4: 1})
+    tabela.mesclar(1, 2)
+    tabela.mesclar(2, 3)
+
+    # Tarefa gravada com o id antigo passa para outro id da mesma cadeia
+    tabela.sincronizar(None, tarefa(2), tarefa(1))
+    assert tabela.contagem(3) == 3
+
+    # ... e sai da cadeia para D, e volta por outro apelido
+    tabela.sincronizar(None, tarefa(4), tarefa(1))
+    assert (tabela.contagem(3), tabela.contagem(4)) == (2, 2)
+    tabela.sincronizar(None, tarefa(2), tarefa(4))
+    assert (tabela.contagem(3), tabela.contagem(4)) == (3, 1)
+
+    # Criar e excluir pelo apelido
+    tabela.sincronizar(None, tarefa(1), None)
+    tabela.sincronizar(None, None, tarefa(4))
+    assert (tabela.contagem(1), tabela.contagem(4)) == (4, 0)
+    assert tabela.remover(4) and not tabela.remover(2)
+
+    # Mesclar depois das mudanças soma a contagem atual
+    tabela.mesclar(3, tabela.adicionar('E'))
+    assert tabela.contagem(5) == 4 and tabela.equivalentes([5]) == {1, 2, 3, 5}
+
+
+def test_nome_repetido():
+    tabela = tabela_abc()
+    with pytest.raises(ValueError):
+        tabela.adicionar('A')
+    tabela.mesclar(1, 2)
+    assert tabela.adicionar('A') == 4
+    with pytest.raises(ValueError):
+        tabela.renomear(3, 'B')
@@ -0,0 +1,158 @@
+import random
+
+import pytest
+
+from dependencias import CicloDependencia, GrafoPrerequisitos
+
+
+def arestas(grafo):
+    return {(pre, id_) for id_, pres in grafo._antes.items() for pre in pres}
+
+
+def alcanca(arestas_atuais, origem, destino):
+    # Busca ingênua para servir de referência
+    vistos, pilha = {origem}, [origem]
+    while pilha:
+        no = pilha.pop()
+        if no == destino:
+            return True
+        for pre, id_ in arestas_atuais:
+            if pre == no and id_ not in vistos:
+                vistos.add(id_)
+                pilha.append(id_)
+    return False
+
+
+def conferir_invariantes(grafo, tarefas):
+    ligacoes = arestas(grafo)
+    for pre, id_ in ligacoes:
+        assert grafo._ordem[pre] < grafo._ordem[id_]
+        assert id_ in grafo._depois[pre]
+    assert sum(len(sucessores) for sucessores in grafo._depois.values()) == len(ligacoes)
+    # Só tarefas com alguma ligação são nós
+    assert set(grafo._ordem) == {no for ligacao in ligacoes for no in ligacao}
+    assert len(set(grafo._ordem.values())) == len(grafo._ordem)
+    for id_ in grafo._ordem:
+        abertas = sum(1 for pre in grafo._antes[id_] if tarefas[pre]['status'] != 'Concluída')
+        assert grafo._pendentes[id_] == abertas
+        assert grafo.bloqueada(id_) == (abertas > 0)
+    posicao = {id_: i for i, id_ in enumerate(grafo.ordem_topologica())}
+    assert all(posicao[pre] < posicao[id_] for pre, id_ in ligacoes)
+
+
+def criar_tarefas(n):
+    return {id_: {'id': id_, 'status': 'Pendente', 'esforco': 1.0} for id_ in range(1, n + 1)}
+
+
+def test_ciclo_e_laco_sao_rejeitados():
+    tarefas = criar_tarefas(3)
+    grafo = GrafoPrerequisitos(tarefas.get)
+    grafo.adicionar(1, 2)
+    grafo.adicionar(2, 3)
+
+    with pytest.raises(CicloDependencia):
+        grafo.adicionar(3, 1)
+    with pytest.raises(CicloDependencia):
+        grafo.adicionar(2, 2)
+    assert arestas(grafo) == {(1, 2), (2, 3)}
+    conferir_invariantes(grafo, tarefas)
+
+
+def test_definir_prerequisitos_desfaz_tudo_quando_ha_ciclo():
+    tarefas = criar_tarefas(5)
+    grafo = GrafoPrerequisitos(tarefas.get)
+    grafo.adicionar(1, 2)
+    grafo.adicionar(2, 3)
+    antes = (arestas(grafo), dict(grafo._pendentes), set(grafo._ordem))
+
+    with pytest.raises(CicloDependencia):
+        grafo.definir_prerequisitos(1, [4, 5, 3])
+
+    assert (arestas(grafo), dict(grafo._pendentes), set(grafo._ordem)) == antes
+    conferir_invariantes(grafo, tarefas)
+
+
+def test_definir_prerequisitos_desfaz_tudo_quando_a_tarefa_nao_existe():
+    tarefas = criar_tarefas(3)
+    grafo = GrafoPrerequisitos(tarefas.get)
+    grafo.adicionar(1, 2)
+
+    with pytest.raises(KeyError):
+        grafo.definir_prerequisitos(2, [1, 3, 99])
+
+    assert arestas(grafo) == {(1, 2)}
+    conferir_invariantes(grafo, tarefas)
+
+
+def test_pendentes_acompanham_conclusao_e_exclusao():
+    tarefas = criar_tarefas(3)
+    grafo = GrafoPrerequisitos(tarefas.get)
+    grafo.definir_prerequisitos(3, [1, 2])
+    assert grafo.bloqueios(3) and grafo.bloqueada(3)
+
+    for id_ in (1, 2):
+        anterior = tarefas[id_]
+        tarefas[id_] = dict(anterior, status='Concluída')
+        grafo.sincronizar(id_, tarefas[id_], anterior)
+    assert not grafo.bloqueada(3)
+
+    anterior = tarefas[2]
+    tarefas[2] = dict(anterior, status='Pendente')
+    grafo.sincronizar(2, tarefas[2], anterior)
+    assert grafo.bloqueios(3) == [2]
+
+    grafo.sincronizar(2, None, tarefas.pop(2))
+    assert not grafo.bloqueada(3)
+    assert 2 not in grafo
+    conferir_invariantes(grafo, tarefas)
+
+
+def test_caminho_critico_soma_a_cadeia_aberta_mais_longa():
+    tarefas = criar_tarefas(4)
+    tarefas[1]['esforco'] = 5.0
+    grafo = GrafoPrerequisitos(tarefas.get)
+    grafo.adicionar(1, 4)
+    grafo.adicionar(2, 3)
+    grafo.adicionar(3, 4)
+
+    assert grafo.caminho_critico(4) == ([1, 4], 6.0)
+
+
+def test_operacoes_aleatorias_mantem_invariantes():
+    rng = random.Random(29)
+    tarefas = criar_tarefas(40)
+    grafo = GrafoPrerequisitos(tarefas.get)
+
+    for _ in range(1500):
+        acao = rng.random()
+        if acao < 0.55:
+            pre, id_ = rng.sample(list(tarefas), 2)
+            ciclo = alcanca(arestas(grafo), id_, pre)
+            try:
+                grafo.adicionar(pre, id_)
+            except CicloDependencia:
+                assert ciclo
+            else:
+                assert not ciclo
+        elif acao < 0.75 and arestas(grafo):
+            grafo.remover(*rng.choice(sorted(arestas(grafo))))
+        elif acao < 0.85:
+            id_ = rng.choice(list(tarefas))
+            novos = rng.sample([t for t in tarefas if t != id_], rng.randint(0, 3))
+            antes = arestas(grafo)
+            try:
+                grafo.definir_prerequisitos(id_, novos)
+            except CicloDependencia:
+                assert arestas(grafo) == antes
+            else:
+                assert grafo.prerequisitos(id_) == set(novos)
+        elif acao < 0.97:
+            id_ = rng.choice(list(tarefas))
+            anterior = tarefas[id_]
+            tarefas[id_] = dict(anterior, status=rng.choice(('Pendente', 'Concluída')))
+            grafo.sincronizar(id_, tarefas[id_], anterior)
+        else:
+            id_ = rng.choice(list(tarefas))
+            grafo.sincronizar(id_, None, tarefas.pop(id_))
+            tarefas[id_] = {'id': id_, 'status': 'Pendente', 'esforco': 1.0}
+        conferir_invariantes(grafo, tarefas)
@@ -0,0 +1,120 @@
+import random
+from datetime import date, datetime, timedelta
+
+from historico import HistoricoProgresso, RollupDiario
+from tarefas import BaseTarefas, TarefasSessao
+
+STATUS = ('Pendente', 'Em Progresso', 'Concluída')
+
+
+def nova_tarefa(rng, id_, agora):
+    status = rng.choice(STATUS)
+    criada_em = agora - timedelta(days=rng.randrange(60))
+    return {
+        'id': id_,
+        'titulo': f"Tarefa {id_}",
+        'categoria': rng.randint(1, 3),
+        'prioridade': 'Média',
+        'status': status,
+        'prazo': agora + timedelta(days=rng.randrange(-40, 20)),
+        'criada_em': criada_em,
+        'concluida_em': criada_em + timedelta(days=rng.randrange(50)) if status == 'Concluída' else None,
+    }
+
+
+def sem_zeros(linhas):
+    return {chave: list(valores) for chave, valores in linhas.items() if any(valores)}
+
+
+def test_incremental_igual_a_reconstrucao():
+    rng = random.Random(31)
+    agora = datetime.now()
+    base = BaseTarefas([nova_tarefa(rng, id_, agora) for id_ in range(1, 41)])
+    tarefas = TarefasSessao(base)
+    historico = HistoricoProgresso(RollupDiario(base.tarefas))
+    tarefas.inscrever(historico.sincronizar)
+    excluidas = []
+
+    for _ in range(600):
+        ids = [t['id'] for t in tarefas]
+        operacao = rng.random()
+        if operacao < 0.2 or not ids:
+            tarefas.adicionar(nova_tarefa(rng, tarefas.proximo_id(), agora))
+        elif operacao < 0.7:
+            tarefas.atualizar(rng.choice(ids), status=rng.choice(STATUS))
+        elif operacao < 0.9:
+            tarefas.atualizar(
+                rng.choice(ids),
+                prazo=agora + timedelta(days=rng.randrange(-40, 20)),
+                categoria=rng.randint(1, 3),
+            )
+        else:
+            id_ = rng.choice(ids)
+            excluidas.append(tarefas.obter(id_))
+            tarefas.remover(id_)
+
+    reconstruido = RollupDiario(tarefas)
+    for tarefa in excluidas:
+        reconstruido.somar(tarefa, 1, excluida_em=agora)
+    assert sem_zeros(historico.linhas()) == sem_zeros(reconstruido.linhas)
+
+
+def test_atrasada_concluida_continua_atrasada_nos_dias_passados():
+    hoje = date(2030, 3, 31)
+    meia_noite = datetime.combine(hoje, datetime.min.time())
+    tarefa = {
+        'id': 1, 'categoria': 1, 'status': 'Concluída',
+        'criada_em': meia_noite - timedelta(days=45),
+        'prazo': meia_noite - timedelta(days=31),
+        'concluida_em': meia_noite - timedelta(days=1),
+    }
+    historico = HistoricoProgresso(RollupDiario([tarefa]))
+    serie = {ponto['dia']: ponto for ponto in historico.serie_diaria(hoje - timedelta(days=40), hoje)}
+
+    # Atrasada do dia seguinte ao prazo até a véspera da conclusão
+    assert serie[hoje - timedelta(days=31)]['atrasadas'] == 0
+    assert serie[hoje - timedelta(days=30)]['atrasadas'] == 1
+    assert serie[hoje - timedelta(days=2)]['atrasadas'] == 1
+    assert serie[hoje - timedelta(days=1)]['atrasadas'] == 0
+    assert serie[hoje - timedelta(days=2)]['abertas'] == 1
+    assert serie[hoje]['abertas'] == 0
+
+
+def test_exclusao_fecha_o_atraso_no_dia_da_exclusao():
+    agora = datetime.now()
+    tarefa = {
+        'id': 1, 'titulo': 'Atrasada', 'categoria': 1, 'prioridade': 'Média', 'status': 'Pendente',
+        'criada_em': agora - timedelta(days=10), 'prazo': agora - timedelta(days=5), 'concluida_em': None,
+    }
+    base = BaseTarefas([tarefa])
+    tarefas = TarefasSessao(base)
+    historico = HistoricoProgresso(RollupDiario(base.tarefas))
+    tarefas.inscrever(historico.sincronizar)
+    hoje = agora.date()
+
+    antes = historico.serie_diaria(hoje - timedelta(days=6), hoje)
+    tarefas.remover(1)
+    depois = historico.serie_diaria(hoje - timedelta(days=6), hoje)
+
+    assert [p['atrasadas'] for p in antes] == [0, 0, 1, 1, 1, 1, 1]
+    assert [p['atrasadas'] for p in depois] == [0, 0, 1, 1, 1, 1, 0]
+    assert depois[-1]['abertas'] == 0
+
+
+def test_transicoes_de_status_sao_carimbadas():
+    base = BaseTarefas([])
+    tarefas = TarefasSessao(base)
+    tarefa = tarefas.adicionar({'id': 1, 'titulo': 'T', 'categoria': 1, 'prioridade': 'Média',
+                                'status': 'Pendente', 'prazo': datetime.now()})
+    assert tarefa['iniciada_em'] is None and tarefa['concluida_em'] is None
+
+    tarefas.atualizar(1, status='Em Progresso')
+    iniciada_em = tarefas.obter(1)['iniciada_em']
+    assert iniciada_em is not None
+
+    tarefas.atualizar(1, status='Concluída')
+    assert tarefas.obter(1)['iniciada_em'] == iniciada_em
+    assert tarefas.obter(1)['concluida_em'] >= iniciada_em
+
+    tarefas.atualizar(1, status='Pendente')
+    assert tarefas.obter(1)['iniciada_em'] is None and tarefas.obter(1)['concluida_em'] is None
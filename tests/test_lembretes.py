@@ -0,0 +1,106 @@
+import gc
+import time
+from datetime import datetime, timedelta
+
+from lembretes import EM_BREVE, VENCIDA, CaixaEntrada, ServicoLembretes
+from tarefas import BaseTarefas, TarefasSessao
+
+
+def tarefa(id_, dias, titulo='Tarefa'):
+    prazo = datetime.combine(datetime.now().date() + timedelta(days=dias), datetime.min.time())
+    return {'id': id_, 'titulo': titulo, 'status': 'Pendente', 'prazo': prazo}
+
+
+def test_vencida_so_depois_do_dia_do_prazo():
+    servico = ServicoLembretes()
+    servico.agendar('s', {'id': 1, 'titulo': 'T', 'status': 'Pendente', 'prazo': datetime(2030, 1, 10)}, agora=0)
+
+    instantes = sorted((entrada[0], entrada[4].tipo) for entrada in servico._heap)
+    assert instantes == [
+        (datetime(2030, 1, 10).timestamp(), EM_BREVE),
+        (datetime(2030, 1, 11).timestamp(), VENCIDA),
+    ]
+
+
+def test_base_agendada_uma_vez_para_todas_as_sessoes():
+    base = BaseTarefas([tarefa(id_, 30) for id_ in range(1, 51)])
+    servico = ServicoLembretes()
+    sessoes = [TarefasSessao(base) for _ in range(100)]
+    for indice, sessao in enumerate(sessoes):
+        servico.registrar_sessao(f"s{indice}", 'hoje', base.tarefas, sessao)
+
+    assert len(servico) == 50
+    assert len(servico._heap) == 100
+
+
+def test_sessao_coletada_libera_heap_e_caixa():
+    base = BaseTarefas([tarefa(1, 30)])
+    caixa = CaixaEntrada()
+    servico = ServicoLembretes([caixa])
+    servico.iniciar()
+    try:
+        sessoes = []
+        for indice in range(1000):
+            sessao = TarefasSessao(base)
+            servico.registrar_sessao(f"s{indice}", 'hoje', base.tarefas, sessao)
+            sessao.adicionar(tarefa(2, 10, f"Própria {indice}"))
+            sessoes.append(sessao)
+        assert len(servico) == 1001
+
+        del sessoes, sessao
+        gc.collect()
+        limite = time.monotonic() + 5
+        while servico._bases and time.monotonic() < limite:
+            time.sleep(0.01)
+
+        assert len(servico) == 0
+        assert not servico._sessoes and not servico._bases
+        assert not caixa._caixas
+        assert len(servico._heap) <= 64
+    finally:
+        servico.parar()
+
+
+def test_lembrete_da_base_respeita_a_versao_da_sessao():
+    base = BaseTarefas([tarefa(1, -3, 'Atrasada')])
+    caixa = CaixaEntrada()
+    gerais = []
+    servico = ServicoLembretes([caixa, gerais.append])
+    sessao_a, sessao_b = TarefasSessao(base), TarefasSessao(base)
+    servico.registrar_sessao('a', 'hoje', base.tarefas, sessao_a)
+    servico.registrar_sessao('b', 'hoje', base.tarefas, sessao_b)
+    sessao_a.atualizar(1, titulo='Editada')
+
+    with servico._condicao:
+        disparar = servico._vencidas()
+    servico._entregar(disparar)
+    assert [(lembrete.titulo, lembrete.tipo) for lembrete in caixa.drenar('a')] == [('Editada', VENCIDA)]
+    assert [(lembrete.titulo, lembrete.tipo) for lembrete in caixa.drenar('b')] == [('Atrasada', VENCIDA)]
+    assert sorted((lembrete.sessao or '', lembrete.titulo) for lembrete in gerais) == [
+        ('', 'Atrasada'),
+        ('a', 'Editada'),
+    ]
+
+    # Uma sessão nova recebe os lembretes da base que já dispararam, só na caixa dela
+    sessao_c = TarefasSessao(base)
+    servico.registrar_sessao('c', 'hoje', base.tarefas, sessao_c)
+    assert [(lembrete.sessao, lembrete.tipo) for lembrete in caixa.drenar('c')] == [('c', VENCIDA)]
+    assert len(gerais) == 2
+
+
+def test_destinos_gerais_recebem_a_base_uma_vez():
+    base = BaseTarefas([tarefa(id_, -2) for id_ in range(1, 6)])
+    caixa = CaixaEntrada()
+    gerais = []
+    servico = ServicoLembretes([caixa, gerais.append])
+    sessoes = [TarefasSessao(base) for _ in range(200)]
+    for indice, sessao in enumerate(sessoes):
+        servico.registrar_sessao(f"s{indice}", 'hoje', base.tarefas, sessao)
+
+    with servico._condicao:
+        disparar = servico._vencidas()
+    servico._entregar(disparar)
+
+    assert len(gerais) == 5
+    assert all(lembrete.sessao is None for lembrete in gerais)
+    assert all(len(caixa.drenar(f"s{indice}")) == 5 for indice in range(200))
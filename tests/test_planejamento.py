@@ -0,0 +1,134 @@
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from planejamento import PlanejadorEstudos, PlanoBase
+
+HOJE = date(2026, 3, 2)
+PRIORIDADES = ('Alta', 'Média', 'Baixa')
+STATUS = ('Pendente', 'Em Progresso', 'Concluída')
+
+
+def nova_tarefa(rng, id_):
+    # Esforços em múltiplos de 0.5 somam sem erro de arredondamento
+    return {
+        'id': id_,
+        'prioridade': rng.choice(PRIORIDADES),
+        'status': rng.choice(STATUS),
+        'prazo': datetime.combine(HOJE, datetime.min.time()) + timedelta(days=rng.randint(-5, 60)),
+        'esforco': rng.randint(1, 16) / 2,
+    }
+
+
+def conferir(planejador, tarefas, dias=20):
+    referencia = PlanejadorEstudos(PlanoBase(tarefas.values()), planejador.horas_por_dia, HOJE)
+    assert len(planejador) == len(referencia)
+    assert planejador.total_horas() == referencia.total_horas()
+    for id_ in tarefas:
+        assert planejador.conclusao(id_) == referencia.conclusao(id_)
+    assert planejador.inviaveis() == referencia.inviaveis()
+    assert planejador.plano(dias) == referencia.plano(dias)
+
+
+def test_plano_reparte_esforco_entre_os_dias():
+    tarefas = [
+        {'id': 1, 'prioridade': 'Média', 'status': 'Pendente', 'prazo': datetime(2026, 3, 3), 'esforco': 3.0},
+        {'id': 2, 'prioridade': 'Média', 'status': 'Pendente', 'prazo': datetime(2026, 3, 4), 'esforco': 3.0},
+        {'id': 3, 'prioridade': 'Média', 'status': 'Concluída', 'prazo': datetime(2026, 3, 2), 'esforco': 9.0},
+    ]
+    planejador = PlanejadorEstudos(PlanoBase(tarefas), horas_por_dia=4.0, hoje=HOJE)
+
+    assert planejador.plano(3) == [
+        (HOJE, [(1, 3.0), (2, 1.0)]),
+        (HOJE + timedelta(days=1), [(2, 2.0)]),
+        (HOJE + timedelta(days=2), []),
+    ]
+    assert planejador.conclusao(2) == HOJE + timedelta(days=1)
+    assert planejador.conclusao(3) is None
+    assert planejador.inviaveis() == []
+
+
+def test_prioridade_alta_passa_a_frente_com_um_dia_de_folga():
+    tarefas = [
+        {'id': 1, 'prioridade': 'Baixa', 'status': 'Pendente', 'prazo': datetime(2026, 3, 5), 'esforco': 4.0},
+        {'id': 2, 'prioridade': 'Alta', 'status': 'Pendente', 'prazo': datetime(2026, 3, 6), 'esforco': 4.0},
+    ]
+    planejador = PlanejadorEstudos(PlanoBase(tarefas), horas_por_dia=4.0, hoje=HOJE)
+
+    assert [itens for _, itens in planejador.plano(2)] == [[(2, 4.0)], [(1, 4.0)]]
+
+
+def test_inviaveis_e_mudanca_de_orcamento():
+    tarefas = [
+        {'id': 1, 'prioridade': 'Média', 'status': 'Pendente', 'prazo': datetime(2026, 3, 2), 'esforco': 6.0},
+    ]
+    planejador = PlanejadorEstudos(PlanoBase(tarefas), horas_por_dia=4.0, hoje=HOJE)
+    assert planejador.inviaveis() == [(1, HOJE + timedelta(days=1), HOJE)]
+
+    planejador.definir_horas(6.0)
+    assert planejador.inviaveis() == []
+
+
+def test_incremental_igual_a_reconstrucao():
+    rng = random.Random(7)
+    tarefas = {id_: nova_tarefa(rng, id_) for id_ in range(1, 301)}
+    planejador = PlanejadorEstudos(PlanoBase(tarefas.values()), horas_por_dia=3.5, hoje=HOJE)
+    proximo_id = 301
+
+    for passo in range(400):
+        acao = rng.random()
+        if acao < 0.2:
+            proximo_id += 1
+            tarefa = tarefas[proximo_id] = nova_tarefa(rng, proximo_id)
+            planejador.sincronizar(proximo_id, tarefa, None)
+        elif acao < 0.35 and tarefas:
+            id_ = rng.choice(list(tarefas))
+            anterior = tarefas.pop(id_)
+            planejador.sincronizar(id_, None, anterior)
+        elif tarefas:
+            id_ = rng.choice(list(tarefas))
+            anterior = tarefas[id_]
+            tarefa = tarefas[id_] = dict(nova_tarefa(rng, id_), esforco=anterior['esforco'] if rng.random() < 0.3 else rng.randint(1, 16) / 2)
+            planejador.sincronizar(id_, tarefa, anterior)
+        if passo % 40 == 0:
+            planejador.definir_horas(rng.choice((2.0, 3.5, 4.0, 8.0)))
+        if passo % 10 == 0:
+            conferir(planejador, tarefas)
+    conferir(planejador, tarefas)
+
+
+def test_base_compartilhada_nao_e_alterada_pelas_sessoes():
+    rng = random.Random(3)
+    tarefas = {id_: nova_tarefa(rng, id_) for id_ in range(1, 51)}
+    base = PlanoBase(tarefas.values())
+    chaves_base = list(base.sequencia.chaves)
+    sessao_a = PlanejadorEstudos(base, hoje=HOJE)
+    sessao_b = PlanejadorEstudos(base, hoje=HOJE)
+
+    aberta = next(t for t in tarefas.values() if t['status'] != 'Concluída')
+    sessao_a.sincronizar(aberta['id'], dict(aberta, status='Concluída'), aberta)
+
+    assert base.sequencia.chaves == chaves_base
+    assert sessao_a.conclusao(aberta['id']) is None
+    assert sessao_b.conclusao(aberta['id']) is not None
+    assert len(sessao_a) == len(sessao_b) - 1
+
+
+def test_replanejar_10k_tarefas_abaixo_de_100ms():
+    rng = random.Random(11)
+    tarefas = {id_: nova_tarefa(rng, id_) for id_ in range(1, 10001)}
+    planejador = PlanejadorEstudos(PlanoBase(tarefas.values()), hoje=HOJE)
+    planejador.inviaveis()
+
+    tempos = []
+    for _ in range(5):
+        id_ = rng.choice(list(tarefas))
+        anterior = tarefas[id_]
+        tarefa = tarefas[id_] = dict(anterior, status='Pendente', prazo=anterior['prazo'] + timedelta(days=3))
+        inicio = time.perf_counter()
+        planejador.sincronizar(id_, tarefa, anterior)
+        planejador.conclusao(id_)
+        planejador.inviaveis()
+        planejador.plano(30)
+        tempos.append(time.perf_counter() - inicio)
+    assert min(tempos) < 0.1
@@ -0,0 +1,148 @@
+import random
+from datetime import date, datetime, timedelta
+
+from recorrencia import DIARIA, MENSAL, SEMANAL, AgendaRecorrente, datas
+
+
+def regra(frequencia, inicio, intervalo=1, fim=None):
+    return {
+        'frequencia': frequencia,
+        'intervalo': intervalo,
+        'inicio': datetime.combine(inicio, datetime.min.time()),
+        'fim': datetime.combine(fim, datetime.min.time()) if fim else None,
+    }
+
+
+def ingenua(frequencia, inicio, intervalo, fim_regra, janela_inicio, janela_fim):
+    # Expande a partir da primeira ocorrência, sem pular nada
+    resultado = []
+    ultimo = min(janela_fim, fim_regra) if fim_regra else janela_fim
+    for k in range(10_000):
+        if frequencia == MENSAL:
+            mes = inicio.month - 1 + k * intervalo
+            ano, mes = inicio.year + mes // 12, mes % 12 + 1
+            dia = inicio.day
+            while True:
+                try:
+                    ocorrencia = date(ano, mes, dia)
+                    break
+                except ValueError:
+                    dia -= 1
+        else:
+            ocorrencia = inicio + timedelta(days=k * intervalo * (7 if frequencia == SEMANAL else 1))
+        if ocorrencia > ultimo:
+            break
+        if ocorrencia >= janela_inicio:
+            resultado.append(ocorrencia)
+    return resultado
+
+
+def test_mensal_ajusta_fim_do_mes():
+    mensal = regra(MENSAL, date(2028, 1, 31))
+    assert list(datas(mensal, date(2028, 1, 1), date(2028, 5, 31))) == [
+        date(2028, 1, 31), date(2028, 2, 29), date(2028, 3, 31), date(2028, 4, 30), date(2028, 5, 31),
+    ]
+    assert list(datas(regra(MENSAL, date(2027, 1, 31)), date(2027, 2, 1), date(2027, 2, 28))) == [date(2027, 2, 28)]
+
+
+def test_intervalo_e_fim_da_regra():
+    a_cada_dois_meses = regra(MENSAL, date(2030, 1, 15), intervalo=2, fim=date(2030, 7, 15))
+    assert list(datas(a_cada_dois_meses, date(2029, 1, 1), date(2031, 1, 1))) == [
+        date(2030, 1, 15), date(2030, 3, 15), date(2030, 5, 15), date(2030, 7, 15),
+    ]
+    quinzenal = regra(SEMANAL, date(2030, 1, 7), intervalo=2, fim=date(2030, 2, 3))
+    assert list(datas(quinzenal, date(2030, 1, 8), date(2030, 12, 31))) == [date(2030, 1, 21)]
+
+
+def test_janela_vazia_ou_antes_do_inicio():
+    diaria = regra(DIARIA, date(2030, 1, 10), fim=date(2030, 1, 20))
+    assert list(datas(diaria, date(2030, 1, 1), date(2030, 1, 9))) == []
+    assert list(datas(diaria, date(2030, 1, 21), date(2030, 2, 1))) == []
+    assert list(datas(diaria, date(2030, 1, 20), date(2030, 1, 20))) == [date(2030, 1, 20)]
+
+
+def test_igual_a_expansao_ingenua():
+    rng = random.Random(7)
+    for _ in range(500):
+        frequencia = rng.choice([DIARIA, SEMANAL, MENSAL])
+        inicio = date(2028, 1, 1) + timedelta(days=rng.randrange(730))
+        intervalo = rng.randint(1, 4)
+        fim_regra = inicio + timedelta(days=rng.randrange(900)) if rng.random() < 0.5 else None
+        janela_inicio = inicio + timedelta(days=rng.randrange(-60, 600))
+        janela_fim = janela_inicio + timedelta(days=rng.randrange(120))
+
+        obtidas = list(datas(regra(frequencia, inicio, intervalo, fim_regra), janela_inicio, janela_fim))
+        assert obtidas == ingenua(frequencia, inicio, intervalo, fim_regra, janela_inicio, janela_fim)
+
+
+def agenda_diaria():
+    return AgendaRecorrente([dict(
+        regra(DIARIA, date(2030, 1, 1)),
+        id=1, titulo='Backup', categoria=1, prioridade='Média',
+    )])
+
+
+def prazos(agenda, inicio, fim):
+    return [(o['id'], o['prazo'].date(), o['status']) for o in agenda.ocorrencias(inicio, fim)]
+
+
+def test_concluir_uma_ocorrencia():
+    agenda = agenda_diaria()
+    assert agenda.atualizar('1@2030-01-02', status='Concluída')['status'] == 'Concluída'
+    assert prazos(agenda, date(2030, 1, 1), date(2030, 1, 3)) == [
+        ('1@2030-01-01', date(2030, 1, 1), 'Pendente'),
+        ('1@2030-01-02', date(2030, 1, 2), 'Concluída'),
+        ('1@2030-01-03', date(2030, 1, 3), 'Pendente'),
+    ]
+
+
+def test_editar_move_o_prazo_para_fora_da_janela():
+    agenda = agenda_diaria()
+    agenda.atualizar('1@2030-01-02', titulo='Backup extra')
+    agenda.atualizar('1@2030-01-02', prazo=datetime(2030, 2, 10, 9))
+    assert [o['id'] for o in agenda.ocorrencias(date(2030, 1, 1), date(2030, 1, 3))] == ['1@2030-01-01', '1@2030-01-03']
+
+    fevereiro = list(agenda.ocorrencias(date(2030, 2, 10), date(2030, 2, 10)))
+    assert [o['id'] for o in fevereiro] == ['1@2030-02-10', '1@2030-01-02']
+    assert fevereiro[1]['titulo'] == 'Backup extra'
+
+    # Voltar o prazo tira a ocorrência de fevereiro sem duplicá-la em janeiro
+    agenda.atualizar('1@2030-01-02', prazo=datetime(2030, 1, 2))
+    assert [o['id'] for o in agenda.ocorrencias(date(2030, 2, 10), date(2030, 2, 10))] == ['1@2030-02-10']
+    assert [o['id'] for o in agenda.ocorrencias(date(2030, 1, 2), date(2030, 1, 2))] == ['1@2030-01-02']
+
+
+def test_excluir_uma_ocorrencia():
+    agenda = agenda_diaria()
+    agenda.atualizar('1@2030-01-02', status='Em Progresso')
+    assert agenda.remover('1@2030-01-02')
+    assert not agenda.remover('1@2030-01-02')
+    assert agenda.obter('1@2030-01-02') is None
+    assert agenda.atualizar('1@2030-01-02', status='Concluída') is None
+    assert [o['id'] for o in agenda.ocorrencias(date(2030, 1, 1), date(2030, 1, 3))] == ['1@2030-01-01', '1@2030-01-03']
+
+
+def test_remover_regra_descarta_excecoes():
+    agenda = agenda_diaria()
+    outra = agenda.adicionar_regra(dict(regra(SEMANAL, date(2030, 1, 1)), titulo='Relatório', categoria=1, prioridade='Alta'))
+    agenda.atualizar('1@2030-01-02', prazo=datetime(2030, 1, 7))
+    agenda.remover('1@2030-01-03')
+    agenda.atualizar(f'{outra}@2030-01-08', status='Concluída')
+
+    agenda.remover_regra(1)
+    assert agenda.regra(1) is None
+    assert [o['id'] for o in agenda.ocorrencias(date(2030, 1, 1), date(2030, 1, 14))] == [f'{outra}@2030-01-01', f'{outra}@2030-01-08']
+    assert all(chave[0] == outra for chave in agenda._excecoes)
+
+
+def test_so_monta_excecoes_da_janela(monkeypatch):
+    agenda = agenda_diaria()
+    for k in range(365):
+        agenda.atualizar(f"1@{(date(2030, 1, 1) + timedelta(days=k)).isoformat()}", status='Concluída')
+    montadas = []
+    original = AgendaRecorrente._montar
+    monkeypatch.setattr(AgendaRecorrente, '_montar', staticmethod(lambda *args: montadas.append(args) or original(*args)))
+
+    semana = list(agenda.ocorrencias(date(2030, 6, 1), date(2030, 6, 7)))
+    assert [o['status'] for o in semana] == ['Concluída'] * 7
+    assert len(montadas) == 7
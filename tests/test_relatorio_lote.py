@@ -0,0 +1,43 @@
+import json
+from datetime import date
+
+from relatorio_lote import gerar_lote, nomes_unicos
+
+
+def quadro(titulo):
+    return [{
+        'id': 1, 'titulo': titulo, 'categoria': 'Álgebra', 'prioridade': 'Alta',
+        'status': 'Pendente', 'prazo': '2030-01-10T00:00:00', 'criada_em': '2030-01-01T00:00:00',
+    }]
+
+
+def test_nomes_unicos(tmp_path):
+    arquivos = [
+        tmp_path / 'turmaA' / 'joao.json',
+        tmp_path / 'turmaB' / 'joao.json',
+        tmp_path / 'turmaA' / 'maria.json',
+        tmp_path / 'turmaB' / 'Maria.json',
+        tmp_path / 'turmaA' / 'ana.json',
+        tmp_path / 'turmaA' / 'ana.json',
+    ]
+    assert nomes_unicos(arquivos) == [
+        'turmaA__joao', 'turmaB__joao', 'turmaA__maria', 'turmaB__Maria', 'turmaA__ana', 'turmaA__ana-2',
+    ]
+
+
+def test_lote_nao_sobrescreve_arquivos_com_o_mesmo_nome(tmp_path):
+    arquivos = []
+    for turma in ('turmaA', 'turmaB'):
+        (tmp_path / turma).mkdir()
+        arquivo = tmp_path / turma / 'joao.json'
+        arquivo.write_text(json.dumps(quadro(f"Lista {turma}")), encoding='utf-8')
+        arquivos.append(arquivo)
+
+    saida = tmp_path / 'saida'
+    resumos, erros = gerar_lote(arquivos, saida, processos=1, hoje=date(2030, 1, 5))
+
+    assert not erros
+    assert [resumo['nome'] for resumo in resumos] == ['turmaA__joao', 'turmaB__joao']
+    for turma in ('turmaA', 'turmaB'):
+        assert f"Lista {turma}" in (saida / f"{turma}__joao.html").read_text(encoding='utf-8')
+        assert json.loads((saida / f"{turma}__joao.json").read_text(encoding='utf-8'))['urgentes'][0]['titulo'] == f"Lista {turma}"